@@ -0,0 +1,26 @@
+# SPDX-FileCopyrightText: 2026 PN5180-tagomatic contributors
+# SPDX-License-Identifier: GPL-3.0-or-later
+
+"""Hexdump formatting shared by the example programs."""
+
+# Maps non-printable bytes to "." for the ASCII column.
+_PRINTABLE = bytes(b if 32 <= b <= 126 else ord(".") for b in range(256))
+
+
+def to_printable(data: bytes) -> str:
+    """Return data as ASCII, with non-printable bytes shown as "."."""
+    return data.translate(_PRINTABLE).decode("ascii")
+
+
+def hexdump_row(offset: int, chunk: bytes) -> str:
+    """Format one row of a memory dump."""
+    return f"({offset:03x}): {chunk.hex(' ')} {to_printable(chunk)}"
+
+
+def hexdump(data: bytes) -> str:
+    """Format data as a memory dump, 16 bytes per line."""
+    rows = [
+        hexdump_row(offset, data[offset : offset + 16])
+        for offset in range(0, len(data), 16)
+    ]
+    return "".join(row + "\n" for row in rows)
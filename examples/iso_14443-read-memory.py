@@ -14,6 +14,8 @@ Usage:
 import argparse
 import sys
 
+from _hexdump import hexdump
+
 from pn5180_tagomatic import PN5180, RxProtocol, TxProtocol
 
 
@@ -52,13 +54,7 @@ def main() -> int:
                 memory = card.read_memory(0, 512)
 
                 # Display memory content
-                for offset in range(0, len(memory), 16):
-                    chunk = memory[offset : offset + 16]
-                    ascii_values = "".join(
-                        chr(byte) if 32 <= byte <= 126 else "."
-                        for byte in chunk
-                    )
-                    print(f"({offset:03x}): {chunk.hex(' ')} {ascii_values}")
+                sys.stdout.write(hexdump(memory))
 
                 ndef_result = card.get_ndef(memory)
                 if ndef_result is not None:
@@ -12,6 +12,8 @@ Usage:
 import argparse
 import sys
 
+from _hexdump import to_printable
+
 from pn5180_tagomatic import PN5180
 from pn5180_tagomatic.constants import (
     RxProtocol,
@@ -60,10 +62,7 @@ def main() -> int:
                 memory = card.read_memory(16, 4)
                 memory = memory[:4]
                 # Display memory content
-                ascii_values = "".join(
-                    chr(byte) if 32 <= byte <= 126 else "." for byte in memory
-                )
-                print(f"{memory.hex(' ')} {ascii_values}")
+                print(f"{memory.hex(' ')} {to_printable(memory)}")
 
         return 0
 
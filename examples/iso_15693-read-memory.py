@@ -15,6 +15,8 @@ Usage:
 import argparse
 import sys
 
+from _hexdump import hexdump
+
 from pn5180_tagomatic import PN5180
 from pn5180_tagomatic.constants import (
     RxProtocol,
@@ -57,21 +59,15 @@ def main() -> int:
 
                     card = session.connect_iso15693(uids[0])
 
+                    chunks = []
                     try:
-                        memory = b""
                         for offset in range(0, 512, 16):
-                            chunk = card.read_memory(offset, 16)
-                            memory += chunk
-                            ascii_values = "".join(
-                                chr(byte) if 32 <= byte <= 126 else "."
-                                for byte in chunk
-                            )
-                            print(
-                                f"({offset:03x}): {chunk.hex(' ')} {ascii_values}"
-                            )
+                            chunks.append(card.read_memory(offset, 16))
                     except TimeoutError:
                         # Done
                         pass
+                    memory = b"".join(chunks)
+                    sys.stdout.write(hexdump(memory))
                     ndef_result = card.get_ndef(memory)
                     if ndef_result is not None:
                         start, mem = ndef_result
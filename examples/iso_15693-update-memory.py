@@ -15,6 +15,8 @@ Usage:
 import argparse
 import sys
 
+from _hexdump import hexdump
+
 from pn5180_tagomatic import PN5180
 from pn5180_tagomatic.constants import (
     RxProtocol,
@@ -59,15 +61,7 @@ def main() -> int:
                     card.write_memory(4, b" Hello! ")
 
                     memory = card.read_memory()
-                    for offset in range(0, len(memory), 16):
-                        chunk = memory[offset : offset + 16]
-                        ascii_values = "".join(
-                            chr(byte) if 32 <= byte <= 126 else "."
-                            for byte in chunk
-                        )
-                        print(
-                            f"({offset:03x}): {chunk.hex(' ')} {ascii_values}"
-                        )
+                    sys.stdout.write(hexdump(memory))
                 else:
                     print("\nNo tags found")
 
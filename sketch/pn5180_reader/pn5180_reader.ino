@@ -69,6 +69,11 @@ static const uint8_t PN5180_RF_OFF = 0x17;
 static const uint8_t PN5180_CONFIGURE_TESTBUS_DIGITAL = 0x18;
 static const uint8_t PN5180_CONFIGURE_TESTBUS_ANALOG = 0x19;
 
+// PN5180 registers:
+static const uint8_t PN5180_REG_IRQ_ENABLE = 0x01;
+static const uint8_t PN5180_REG_IRQ_CLEAR = 0x03;
+static const uint8_t PN5180_REG_RX_STATUS = 0x13;
+
 // Pin definitions for Raspberry Pi Pico Zero
 static const unsigned long PN5180_MISO = 0u;
 static const unsigned long PN5180_MOSI = 3u;
@@ -673,6 +678,21 @@ static int32_t epc_retrieve_inventory_result_size() {
   return result;
 }
 
+/**
+ * Retrieves the result size from the EPC algorithm and reads the result.
+ *
+ * Returns status (0 at success, < 0 at failure) and the result bytes.
+ */
+static Object<int, Vector<uint8_t>> epc_read_inventory_result() {
+  auto size = epc_retrieve_inventory_result_size();
+  if (size <= 0) {
+    Object<int, Vector<uint8_t>> result;
+    get<0>(result) = size;
+    return result;
+  }
+  return read_data(size);
+}
+
 // TODO: Make an inventory command that implements the whole algorithm
 
 /**
@@ -773,6 +793,94 @@ static bool wait_for_irq(unsigned long timeout) {
   return is_irq_set();
 }
 
+/**
+ * Reads RX_STATUS and the received bytes into rx_status and data.
+ *
+ * Returns 0 at success, < 0 at failure.
+ */
+static int read_rx(uint32_t& rx_status, Vector<uint8_t>& data) {
+  auto status = read_register(PN5180_REG_RX_STATUS);
+  if (get<0>(status) < 0) {
+    return get<0>(status);
+  }
+  rx_status = get<1>(status);
+
+  uint16_t len = rx_status & 511;
+  if (len > 0) {
+    auto received = read_data(len);
+    if (get<0>(received) < 0) {
+      return get<0>(received);
+    }
+    data.resize(len);
+    for (size_t i = 0; i < len; ++i) {
+      data[i] = get<1>(received)[i];
+    }
+  }
+  return 0;
+}
+
+/**
+ * Waits upto timeout milliseconds until the IRQ is set, then reads
+ * RX_STATUS and the received bytes.
+ *
+ * Returns status (1 if the IRQ was set, 0 if not, < 0 at failure),
+ * the RX_STATUS value and the received bytes.
+ */
+static Object<int, uint32_t, Vector<uint8_t>> wait_and_read_rx(unsigned long timeout) {
+  Object<int, uint32_t, Vector<uint8_t>> result;
+  get<0>(result) = 0;
+  get<1>(result) = 0;
+  if (!wait_for_irq(timeout)) {
+    return result;
+  }
+
+  auto retval = read_rx(get<1>(result), get<2>(result));
+  get<0>(result) = retval < 0 ? retval : 1;
+  return result;
+}
+
+/**
+ * Sends data and waits upto timeout milliseconds for the answer.
+ *
+ * Clears and enables only the RX IRQ, sends the data, waits for the
+ * IRQ, then disables and clears the IRQs and reads the received bytes.
+ *
+ * Returns status (1 if an answer was received, 0 at timeout,
+ * < 0 at failure) and the received bytes.
+ */
+static Object<int, Vector<uint8_t>> transceive(uint8_t bits, Vector<uint8_t>& values,
+                                               unsigned long timeout) {
+  Object<int, Vector<uint8_t>> result;
+  get<0>(result) = 0;
+
+  int retval = write_register(PN5180_REG_IRQ_CLEAR, 1);
+  if (retval == 0) {
+    retval = write_register(PN5180_REG_IRQ_ENABLE, 1);
+  }
+  if (retval == 0) {
+    retval = send_data(bits, values);
+  }
+  if (retval < 0) {
+    get<0>(result) = retval;
+    return result;
+  }
+
+  if (!wait_for_irq(timeout)) {
+    return result;
+  }
+
+  retval = write_register(PN5180_REG_IRQ_ENABLE, 0);
+  if (retval == 0) {
+    retval = write_register(PN5180_REG_IRQ_CLEAR, 1);
+  }
+  if (retval == 0) {
+    uint32_t rx_status;
+    retval = read_rx(rx_status, get<1>(result));
+  }
+  get<0>(result) = retval < 0 ? retval : 1;
+  return result;
+}
+
 /////////////////////////
 // End of RPC commands //
 /////////////////////////
@@ -824,11 +932,14 @@ void loop() {
     epc_inventory, "epc_inventory: Start EPC inventory algorithm. @select_command: Vector of up to 39 bytes. @select_command_final_bits: number of valid bits in final byte. @begin_round: 3 byte array. @timeslot_behavior: timeslot behavior value. @return: 0 at success, < 0 at failure.",
     epc_resume_inventory, "epc_resume_inventory: Continue EPC inventory algorithm. @return: 0 at success, < 0 at failure.",
     epc_retrieve_inventory_result_size, "epc_retrieve_inventory_result_size: Get result size from EPC algorithm. @return: result size in bytes, < 0 at failure.",
+    epc_read_inventory_result, "epc_read_inventory_result: Get the result size from EPC algorithm and read the result. @return: Object with status (0 at success, < 0 at failure) and Vector of result bytes.",
     load_rf_config, "load_rf_config: Load RF config settings for RX/TX. @tx_config: TX configuration index (see table 32). @rx_config: RX configuration index (see table 32). @return: 0 at success, < 0 at failure.",
     rf_on, "rf_on: Turn on RF field. @flags: bit0 turns off collision avoidance for ISO/IEC 18092. bit1 use Active Communication mode. @return: 0 at success, < 0 at failure.",
     rf_off, "rf_off: Turn off RF field. @return: 0 at success, < 0 at failure.",
     is_irq_set, "is_irq_set: Is the IRQ pin set. @return: true if IRQ is set.",
-    wait_for_irq, "wait_for_irq: Wait up to a timeout value for the IRQ to be set. @timeout: time in ms to wait. @return: true if IRQ is set.");
+    wait_for_irq, "wait_for_irq: Wait up to a timeout value for the IRQ to be set. @timeout: time in ms to wait. @return: true if IRQ is set.",
+    wait_and_read_rx, "wait_and_read_rx: Wait up to a timeout value for the IRQ to be set, then read RX_STATUS and the received bytes. @timeout: time in ms to wait. @return: Object with status (1 if IRQ is set, 0 if not, < 0 at failure), RX_STATUS value and Vector of bytes received.",
+    transceive, "transceive: Send data and wait up to a timeout value for the answer. @bits: number of valid bits in final byte. @values: Vector of up to 260 bytes to send. @timeout: time in ms to wait. @return: Object with status (1 if an answer was received, 0 at timeout, < 0 at failure) and Vector of bytes received.");
   // clang-format on
 
   static bool has_reset_after_disconnect = false;
@@ -11,6 +11,8 @@ class UniqueId(Protocol):
     Subtypes contain type specific extensions.
     """
 
+    __slots__ = ()
+
     def uid_as_bytes(self) -> bytes:
         """Returns the UID as bytes"""
 
@@ -26,15 +28,19 @@ class Iso14443AUniqueId(UniqueId):
     It also includes the SAK response.
     """
 
+    __slots__ = ("_uid", "_sak", "_uid_str", "_sak_str")
+
     def __init__(self, uid: bytes, sak: bytes):
         self._uid = uid
         self._sak = sak
+        self._uid_str = uid.hex(":")
+        self._sak_str = sak.hex(":")
 
     def uid_as_bytes(self) -> bytes:
         return self._uid
 
     def uid_as_string(self) -> str:
-        return self._uid.hex(":")
+        return self._uid_str
 
     def sak_as_bytes(self) -> bytes:
         """The SAK response as bytes"""
@@ -42,7 +48,7 @@ class Iso14443AUniqueId(UniqueId):
 
     def sak_as_string(self) -> str:
         """The SAK response as a string"""
-        return self._sak.hex(":")
+        return self._sak_str
 
     def __str__(self) -> str:
         return f"UID: {self.uid_as_string()}, SAK={self.sak_as_string()}"
@@ -54,14 +60,17 @@ class Iso14443AUniqueId(UniqueId):
 class Iso15693UniqueId(UniqueId):
     """ISO/IEC 15693 card identifiers."""
 
+    __slots__ = ("_uid", "_uid_str")
+
     def __init__(self, uid: bytes) -> None:
         self._uid = uid
+        self._uid_str = uid.hex(":")
 
     def uid_as_bytes(self) -> bytes:
         return self._uid
 
     def uid_as_string(self) -> str:
-        return self._uid.hex(":")
+        return self._uid_str
 
     def __str__(self) -> str:
         return f"UID: {self.uid_as_string()}"
@@ -70,6 +79,8 @@ class Iso15693UniqueId(UniqueId):
 class Card(Protocol):
     """Protocol for Cards"""
 
+    __slots__ = ()
+
     @property
     def id(self) -> UniqueId:
         """Returns the card's unique id"""
@@ -264,3 +264,6 @@ class ISO15693Command(IntEnum):
     STAY_QUIET = 0x02
     WRITE_SINGLE_BLOCK = 0x21
     WRITE_MULTIPLE_BLOCKS = 0x24
+    EXTENDED_READ_MULTIPLE_BLOCKS = 0x33
+    EXTENDED_WRITE_SINGLE_BLOCK = 0x31
+    EXTENDED_WRITE_MULTIPLE_BLOCKS = 0x34
@@ -5,10 +5,40 @@
 
 from __future__ import annotations
 
+import struct
+
 from .cards import Card, Iso14443AUniqueId, UniqueId
 from .constants import ISO14443ACommand, MemoryWriteError, MifareKeyType
 from .proxy import PN5180Helper
 
+# Default keys of a MIFARE Classic card (transport configuration).
+_DEFAULT_KEY_A = b"\xff" * 6
+_DEFAULT_KEY_B = b"\x00" * 6
+
+_U16_BE = struct.Struct(">H")
+
+# Plain int copies of the commands used in the page loops.
+_READ = int(ISO14443ACommand.READ)
+_WRITE = int(ISO14443ACommand.WRITE)
+
+
+def _read_tlv_val(memory: bytes, pos: int) -> tuple[int, int]:
+    """Read a TLV type or length field, returns (value, next pos)."""
+    if memory[pos] < 255:
+        return memory[pos], pos + 1
+    return _U16_BE.unpack_from(memory, pos + 1)[0], pos + 3
+
+
+def _mifare_sector(block: int) -> int:
+    """Return the MIFARE Classic sector a block is in.
+
+    Sectors 0-31 have 4 blocks, the sectors after them (on 4K cards)
+    have 16 blocks.
+    """
+    if block < 128:
+        return block >> 2
+    return 32 + ((block - 128) >> 4)
+
 
 class ISO14443ACard(Card):
     """Represents a connected ISO 14443-A card.
@@ -17,6 +47,8 @@ class ISO14443ACard(Card):
     successfully connected via the ISO 14443-A anticollision protocol.
     """
 
+    __slots__ = ("_reader", "_card_id", "_keys_a", "_keys_b")
+
     def __init__(
         self, reader: PN5180Helper, card_id: Iso14443AUniqueId
     ) -> None:
@@ -30,8 +62,8 @@ class ISO14443ACard(Card):
         self._card_id = card_id
         self._keys_a: dict[int, bytes] = {}
         self._keys_b: dict[int, bytes] = {}
-        self._keys_a[-1] = bytes([0xFF, 0xFF, 0xFF, 0xFF, 0xFF, 0xFF])
-        self._keys_b[-1] = bytes([0x00, 0x00, 0x00, 0x00, 0x00, 0x00])
+        self._keys_a[-1] = _DEFAULT_KEY_A
+        self._keys_b[-1] = _DEFAULT_KEY_B
 
     @property
     def id(self) -> UniqueId:
@@ -50,8 +82,11 @@ class ISO14443ACard(Card):
         return 4
 
     def read_memory(self, offset: int = 0, length: int = 255) -> bytes:
-        start_page = offset // self.memory_block_size
-        num_pages = (length + 3) // self.memory_block_size
+        bs = self.memory_block_size
+        # The block size is a power of two, so divide by shifting.
+        shift = bs.bit_length() - 1
+        start_page = offset >> shift
+        num_pages = (length + bs - 1) >> shift
 
         uid = self.id.uid_as_bytes()
         if len(uid) == 4:
@@ -79,13 +114,12 @@ class ISO14443ACard(Card):
         """
         self._reader.turn_on_crc()
 
+        send_and_receive = self._reader.send_and_receive
         memory_parts = []
         end_page = min(start_page + num_pages, 255)
         for page in range(start_page, end_page, 4):
             # Send READ command
-            memory_content = self._reader.send_and_receive(
-                0, bytes([ISO14443ACommand.READ, page])
-            )
+            memory_content = send_and_receive(0, bytes([_READ, page]))
 
             if len(memory_content) < 1:
                 # No more data available
@@ -112,39 +146,37 @@ class ISO14443ACard(Card):
             ValueError: The bytes are not of an even page length or offset not aligned.
         """
 
-        if offset % self.memory_block_size != 0:
+        bs = self.memory_block_size
+        if offset % bs != 0:
             raise ValueError(
                 "Offset not an even multiple of memory_block_size"
             )
 
-        if len(data) % self.memory_block_size != 0:
+        if len(data) % bs != 0:
             raise ValueError(
                 "data's length is not an even multiple of memory_block_size"
             )
 
-        start_page = offset // self.memory_block_size
-
-        for page in range(len(data) // self.memory_block_size):
-            response = self._reader.send_and_wait_for_ack(
-                0,
-                bytes([ISO14443ACommand.WRITE, start_page + page])
-                + data[
-                    offset
-                    + page * self.memory_block_size : offset
-                    + (page + 1) * self.memory_block_size
-                ],
-            )
+        start_page = offset // bs
+
+        # WRITE command frame, reused for every page.
+        frame = bytearray(2 + bs)
+        frame[0] = _WRITE
+        for page in range(len(data) // bs):
+            frame[1] = start_page + page
+            frame[2:] = data[page * bs : (page + 1) * bs]
+            response = self._reader.send_and_wait_for_ack(0, bytes(frame))
 
             if len(response) == 0:
                 raise MemoryWriteError(
-                    offset=offset + page * self.memory_block_size,
+                    offset=offset + page * bs,
                     error_code=0xFF,
                     response_data=b"",
                 )
 
             if (response[0] & 0xF) != 0xA:
                 raise MemoryWriteError(
-                    offset=offset + page * self.memory_block_size,
+                    offset=offset + page * bs,
                     error_code=response[0],
                     response_data=response,
                 )
@@ -182,50 +214,49 @@ class ISO14443ACard(Card):
         self._reader.turn_on_crc()
 
         # Convert UID to 32-bit integer for authentication
-        mifare_uid = uid[3] << 24 | uid[2] << 16 | uid[1] << 8 | uid[0]
+        mifare_uid = int.from_bytes(uid, "little")
+
+        default_key_a = self._keys_a.get(-1)
+        default_key_b = self._keys_b.get(-1)
 
+        send_and_receive = self._reader.send_and_receive
+        mifare_authenticate = self._reader.mifare_authenticate
         memory_parts = []
+        # (sector, key A, key B) of the last successful authentication.
+        authenticated: tuple[int, bytes | None, bytes | None] | None = None
         end_page = min(start_page + num_pages, 255)
         for page in range(start_page, end_page, 4):
-            # Try KEY A
-            key_a = (
-                self._keys_a[page]
-                if page in self._keys_a
-                else self._keys_a.get(-1, None)
-            )
-
-            if key_a is not None:
-                retval_a = self._reader.mifare_authenticate(
-                    key_a, MifareKeyType.KEY_A, page, mifare_uid
-                )
-                if retval_a == 2:  # timeout
-                    break
-            else:
-                retval_a = -1
-
-            # Try KEY B if KEY A failed
-            if retval_a != 0:
-                key_b = (
-                    self._keys_b[page]
-                    if page in self._keys_b
-                    else self._keys_b.get(-1, None)
-                )
-                if key_b is not None:
-                    retval_b = self._reader.mifare_authenticate(
-                        key_b, MifareKeyType.KEY_B, page, mifare_uid
+            key_a = self._keys_a.get(page, default_key_a)
+            key_b = self._keys_b.get(page, default_key_b)
+            auth = (_mifare_sector(page), key_a, key_b)
+            if auth != authenticated:
+                # Try KEY A
+                if key_a is not None:
+                    retval_a = mifare_authenticate(
+                        key_a, MifareKeyType.KEY_A, page, mifare_uid
                     )
-                    if retval_b == 2:  # timeout
-                        break
-                    if retval_b != 0:
-                        # Both keys failed, stop reading
+                    if retval_a == 2:  # timeout
                         break
                 else:
-                    break
+                    retval_a = -1
+
+                # Try KEY B if KEY A failed
+                if retval_a != 0:
+                    if key_b is not None:
+                        retval_b = mifare_authenticate(
+                            key_b, MifareKeyType.KEY_B, page, mifare_uid
+                        )
+                        if retval_b == 2:  # timeout
+                            break
+                        if retval_b != 0:
+                            # Both keys failed, stop reading
+                            break
+                    else:
+                        break
+                authenticated = auth
 
             # Send READ command
-            memory_content = self._reader.send_and_receive(
-                0, bytes([ISO14443ACommand.READ, page])
-            )
+            memory_content = send_and_receive(0, bytes([_READ, page]))
 
             if len(memory_content) < 1:
                 # No more data available
@@ -283,12 +314,13 @@ class ISO14443ACard(Card):
         if cc[0] != 0xE1:
             return None
 
-        major = cc[1] >> 4
-        minor = cc[1] & 0xF
+        version = cc[1]
+        major = version >> 4
+        minor = version & 0xF
 
-        mlen = (cc[2]) * 4
+        mlen = cc[2] * 4
 
-        is_readonly = bool((cc[3] & 0xF0) == 0xF0)
+        is_readonly = (cc[3] & 0xF0) == 0xF0
 
         return (major, minor, mlen, is_readonly)
 
@@ -303,6 +335,10 @@ class ISO14443ACard(Card):
             or None if NDEF couldn't be found.
         """
 
+        if len(memory) < 16:
+            # Too short to hold the CC
+            return None
+
         cc = self.decode_cc(memory[12:16])
         if cc is None:
             return None
@@ -317,20 +353,14 @@ class ISO14443ACard(Card):
 
         pos = 16
 
-        def read_val(memory: bytes, pos: int) -> tuple[int, int]:
-            if memory[pos] < 255:
-                return memory[pos], pos + 1
-            else:
-                return (memory[pos + 1] << 8) | memory[pos + 2], pos + 3
-
         while pos < mlen:
-            typ, pos = read_val(memory, pos)
+            typ, pos = _read_tlv_val(memory, pos)
             if typ == 0:
                 continue
             if typ == 0xFE:
                 # End of TLV
                 return None
-            field_len, pos = read_val(memory, pos)
+            field_len, pos = _read_tlv_val(memory, pos)
             if typ == 0x03:
                 if pos + field_len > mlen:
                     return None
@@ -5,10 +5,176 @@
 
 from __future__ import annotations
 
+import json
+import os
+import struct
+import tempfile
+from collections.abc import Iterator
+from functools import cached_property
+from pathlib import Path
+from typing import NamedTuple
+
 from .cards import Card, Iso15693UniqueId, UniqueId
-from .constants import ISO15693Command, MemoryWriteError
+from .constants import ISO15693Command, ISO15693Error, MemoryWriteError
 from .proxy import PN5180Error, PN5180Helper
 
+# Plain int copies of the commands used when reading and writing memory.
+_READ_MULTIPLE_BLOCKS = int(ISO15693Command.READ_MULTIPLE_BLOCKS)
+_EXTENDED_READ_MULTIPLE_BLOCKS = int(
+    ISO15693Command.EXTENDED_READ_MULTIPLE_BLOCKS
+)
+_WRITE_SINGLE_BLOCK = int(ISO15693Command.WRITE_SINGLE_BLOCK)
+_WRITE_MULTIPLE_BLOCKS = int(ISO15693Command.WRITE_MULTIPLE_BLOCKS)
+_EXTENDED_WRITE_SINGLE_BLOCK = int(ISO15693Command.EXTENDED_WRITE_SINGLE_BLOCK)
+_EXTENDED_WRITE_MULTIPLE_BLOCKS = int(
+    ISO15693Command.EXTENDED_WRITE_MULTIPLE_BLOCKS
+)
+
+# Most bytes read with a single READ MULTIPLE BLOCKS command.
+_MAX_READ_LENGTH = 128
+
+# Most bytes written with a single WRITE MULTIPLE BLOCKS command.
+_MAX_WRITE_LENGTH = 128
+
+# NFC Forum Type 5 Tag capability container magic and TLV types.
+_CC_MAGIC = 0xE1
+_TLV_NULL = 0x00
+_TLV_NDEF = 0x03
+_TLV_TERMINATOR = 0xFE
+
+_U16_BE = struct.Struct(">H")
+# First block and number of blocks - 1, for the (EXTENDED) multiple
+# block commands.
+_BLOCK_RANGE = struct.Struct("BB")
+_EXTENDED_BLOCK_RANGE = struct.Struct("<HH")
+# Block number for the EXTENDED single block commands.
+_EXTENDED_BLOCK = struct.Struct("<H")
+_CC = struct.Struct("4B")
+
+# GET SYSTEM INFORMATION fields after the UID, as (info flag, name), in
+# the order they are sent. The memory size flag covers two bytes.
+_SYS_INFO_FIELDS = (
+    (0x01, "dsfid"),
+    (0x02, "afi"),
+    (0x04, "num_blocks"),
+    (0x04, "block_size"),
+    (0x08, "ic_reference"),
+)
+# The fields kept in the cache file. DSFID and AFI can be changed with
+# WRITE DSFID/AFI, possibly by another reader, so they are never cached.
+_PERSISTED_SYS_INFO_NAMES = frozenset(
+    ("block_size", "num_blocks", "ic_reference")
+)
+
+
+class _SysInfo(NamedTuple):
+    """A card's system information, with defaults for missing fields."""
+
+    block_size: int
+    num_blocks: int
+    dsfid: int | None
+    afi: int | None
+    ic_reference: int | None
+
+
+# Error codes for a command the card doesn't support or recognise.
+_UNSUPPORTED_COMMAND_ERRORS = frozenset((0x01, 0x02))
+
+
+def _iter_tlvs(
+    memory: bytes, start: int, end: int
+) -> Iterator[tuple[int, int, int]]:
+    """Walk the TLV blocks in memory[start:end].
+
+    NULL TLVs are skipped and the walk stops at the terminator TLV.
+
+    Yields:
+        (type, value_offset, value_length) for each TLV.
+    """
+    pos = start
+    # T and L fields are one byte, or 0xFF followed by a 16-bit value.
+    while pos < end:
+        typ = memory[pos]
+        if typ < 255:
+            pos += 1
+        else:
+            typ = _U16_BE.unpack_from(memory, pos + 1)[0]
+            pos += 3
+        if typ == _TLV_NULL:
+            continue
+        if typ == _TLV_TERMINATOR:
+            return
+        field_len = memory[pos]
+        if field_len < 255:
+            pos += 1
+        else:
+            field_len = _U16_BE.unpack_from(memory, pos + 1)[0]
+            pos += 3
+        yield typ, pos, field_len
+        pos += field_len
+
+
+def _sys_info_cache_path() -> Path:
+    """Return the file the system information cache is kept in."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or "~/.cache"
+    return Path(cache_home).expanduser() / "pn5180-tagomatic" / "sysinfo.json"
+
+
+def _load_sys_info_cache() -> dict[str, dict[str, int]]:
+    """Read the persisted system information, by UID in hex."""
+    try:
+        with _sys_info_cache_path().open(encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _persisted_sys_info(uid: bytes) -> dict[str, int] | None:
+    """Return the persisted system information for a card, if any.
+
+    Entries that aren't a dict of persisted fields with int values are
+    ignored, the card is then asked again.
+    """
+    info = _load_sys_info_cache().get(uid.hex())
+    if (
+        not isinstance(info, dict)
+        or not _PERSISTED_SYS_INFO_NAMES.issuperset(info)
+        or not all(type(value) is int for value in info.values())
+        or info.get("block_size", 1) < 1
+        or info.get("num_blocks", 1) < 1
+    ):
+        return None
+    return info
+
+
+def _persist_sys_info(uid: bytes, info: dict[str, int]) -> None:
+    """Save a card's system information in the cache file.
+
+    Failing to write the cache is not an error, the card is asked again
+    the next time.
+    """
+    cache = _load_sys_info_cache()
+    cache[uid.hex()] = info
+    path = _sys_info_cache_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Replace the file as a whole, so readers never see half of it.
+        fd, tmp_name = tempfile.mkstemp(
+            dir=path.parent, prefix=path.name, suffix=".tmp"
+        )
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+        os.replace(tmp_name, path)
+    except OSError:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+
 
 class ISO15693Card(Card):
     """Represents a connected ISO 15693 card.
@@ -18,70 +184,93 @@ class ISO15693Card(Card):
     """
 
     def __init__(
-        self, reader: PN5180Helper, card_id: Iso15693UniqueId
+        self,
+        reader: PN5180Helper,
+        card_id: Iso15693UniqueId,
+        use_cache: bool = False,
     ) -> None:
         """Initialize ISO15693.
 
         Args:
             reader: The PN5180 reader instance.
             card_id: The card's UID
+            use_cache: Keep the card's memory size and IC reference in
+                a file under $XDG_CACHE_HOME (~/.cache), so they are only
+                read from the card the first time it is seen. DSFID and
+                AFI are not cached and are read from the card each time.
         """
         self._reader = reader
         self._card_id = card_id
-        self._block_size = -1
-        self._num_blocks = 32
-        self._dsfid: int | None = None
-        self._afi: int | None = None
-        self._ic_reference: int | None = None
+        self._use_cache = use_cache
+        # False once the card has rejected WRITE MULTIPLE BLOCKS as
+        # unsupported, it is then written one block at a time.
+        self._multiblock_ok = True
 
     @property
     def id(self) -> UniqueId:
         """Get the card's UID."""
         return self._card_id
 
+    @cached_property
+    def _sys_info(self) -> _SysInfo:
+        """The card's system information, read from the card on first use."""
+        if self._use_cache:
+            uid = self._card_id.uid_as_bytes()
+            info = _persisted_sys_info(uid)
+            if info is None:
+                info = self.get_system_information()
+                _persist_sys_info(
+                    uid,
+                    {
+                        name: value
+                        for name, value in info.items()
+                        if name in _PERSISTED_SYS_INFO_NAMES
+                    },
+                )
+        else:
+            info = self.get_system_information()
+        return _SysInfo(
+            info.get("block_size", 4),
+            info.get("num_blocks", 256),
+            info.get("dsfid"),
+            info.get("afi"),
+            info.get("ic_reference"),
+        )
+
     @property
     def dsfid(self) -> int | None:
         """Gets the DSFID value, if supported by card"""
-        self._ensure_sys_info_loaded()
-        return self._dsfid
+        if self._use_cache:
+            return self.get_system_information().get("dsfid")
+        return self._sys_info.dsfid
 
     @property
     def afi(self) -> int | None:
         """Gets the AFI value, if supported by card"""
-        self._ensure_sys_info_loaded()
-        return self._afi
+        if self._use_cache:
+            return self.get_system_information().get("afi")
+        return self._sys_info.afi
 
     @property
     def ic_reference(self) -> int | None:
         """Gets the IC reference value, if supported by card"""
-        self._ensure_sys_info_loaded()
-        return self._ic_reference
-
-    def _ensure_sys_info_loaded(self) -> None:
-        if self._block_size < 0:
-            sys_info = self.get_system_information()
-            self._block_size = sys_info.get("block_size", 4)
-            self._num_blocks = sys_info.get("num_blocks", 256)
-            self._dsfid = sys_info.get("dsfid", None)
-            self._afi = sys_info.get("afi", None)
-            self._ic_reference = sys_info.get("ic_reference", None)
+        return self._sys_info.ic_reference
 
     @property
     def memory_block_size(self) -> int:
-        self._ensure_sys_info_loaded()
-        return self._block_size
+        return self._sys_info.block_size
 
     @property
     def memory_number_of_blocks(self) -> int:
         """Gets the number of blocks the card contains"""
-        self._ensure_sys_info_loaded()
-        return self._num_blocks
+        return self._sys_info.num_blocks
 
     def decode_cc(self, cc: bytes) -> tuple[int, int, int, bool] | None:
         """Decode the CC memory block (block 0)
 
         Args:
-            cc(bytes): The memory from block 0.
+            cc(bytes): The memory from block 0. Any buffer (bytearray,
+                memoryview) works, only the first 4 bytes are used.
 
         Returns:
             (major_version, minor_version, memory size, is readonly)
@@ -91,20 +280,15 @@ class ISO15693Card(Card):
             PN5180Error: If communication with the card fails.
             ValueError: If cc is less than 4 bytes.
         """
-        if len(cc) < 4:
-            raise ValueError("cc should be at least 4 bytes")
+        try:
+            magic, version, size, access = _CC.unpack_from(cc)
+        except struct.error as e:
+            raise ValueError("cc should be at least 4 bytes") from e
 
-        if cc[0] != 0xE1:
+        if magic != _CC_MAGIC:
             return None
 
-        major = cc[1] >> 4
-        minor = cc[1] & 0xF
-
-        mlen = (cc[2] + 1) * 8
-
-        is_readonly = bool(cc[3] & 1)
-
-        return (major, minor, mlen, is_readonly)
+        return (version >> 4, version & 0xF, (size + 1) * 8, bool(access & 1))
 
     def get_ndef(self, memory: bytes) -> tuple[int, bytes] | None:
         """Find the NDEF memory.
@@ -133,26 +317,11 @@ class ISO15693Card(Card):
         if mlen > len(memory):
             return None
 
-        pos = 4
-
-        def read_val(memory: bytes, pos: int) -> tuple[int, int]:
-            if memory[pos] < 255:
-                return memory[pos], pos + 1
-            return (memory[pos + 1] << 8) | memory[pos + 2], pos + 3
-
-        while pos < mlen:
-            typ, pos = read_val(memory, pos)
-            if typ == 0:
-                continue
-            if typ == 0xFE:
-                # End of TLV
-                return None
-            field_len, pos = read_val(memory, pos)
-            if typ == 0x03:
+        for typ, pos, field_len in _iter_tlvs(memory, 4, mlen):
+            if typ == _TLV_NDEF:
                 if pos + field_len > mlen:
                     return None
                 return (pos, memory[pos : pos + field_len])
-            pos += field_len
 
         return None
 
@@ -169,42 +338,57 @@ class ISO15693Card(Card):
         Raises:
             PN5180Error: If communication with the card fails.
         """
-        if offset % self.memory_block_size != 0:
+        bs = self.memory_block_size
+        if offset % bs != 0:
             raise ValueError(
                 "Offset not an even multiple of memory_block_size"
             )
 
-        start_block = offset // self.memory_block_size
+        start_block = offset // bs
 
         if length is None:
-            num_blocks = self._num_blocks
+            num_blocks = self.memory_number_of_blocks
         else:
-            if length % self.memory_block_size != 0:
+            if length % bs != 0:
                 raise ValueError(
                     "length is not an even multiple of memory_block_size"
                 )
-            num_blocks = length // self.memory_block_size
+            num_blocks = length // bs
 
         self._reader.turn_on_crc()
         self._reader.change_mode_to_transceiver()
 
-        # TODO: If num_blocks * memory_block_size > 128, loop
-        # TODO: If start_block > 255, use EXTENDED_READ_MULTIPLE_BLOCKS
-        memory_content = self._reader.send_and_receive_15693(
-            ISO15693Command.READ_MULTIPLE_BLOCKS,
-            bytes([start_block, num_blocks - 1]),
-        )
+        blocks_per_read = max(1, _MAX_READ_LENGTH // bs)
+        end_block = start_block + num_blocks
+        memory = bytearray(num_blocks * bs)
+        pos = 0
+        send_and_receive_15693 = self._reader.send_and_receive_15693
+        for block in range(start_block, end_block, blocks_per_read):
+            count = min(blocks_per_read, end_block - block)
+            if block + count > 256:
+                memory_content = send_and_receive_15693(
+                    _EXTENDED_READ_MULTIPLE_BLOCKS,
+                    _EXTENDED_BLOCK_RANGE.pack(block, count - 1),
+                )
+            else:
+                memory_content = send_and_receive_15693(
+                    _READ_MULTIPLE_BLOCKS,
+                    _BLOCK_RANGE.pack(block, count - 1),
+                )
 
-        if len(memory_content) > 0 and memory_content[0] & 1:
-            memory_content += b"\0"
-            raise PN5180Error(
-                "Got error while reading memory", memory_content[1]
-            )
-        if len(memory_content) < 2:
-            # No more data available
-            return b""
+            if len(memory_content) > 0 and memory_content[0] & 1:
+                code = memory_content[1] if len(memory_content) > 1 else 0
+                raise PN5180Error("Got error while reading memory", code)
 
-        return memory_content[1:]
+            data = memory_content[1 : 1 + count * bs]
+            memory[pos : pos + len(data)] = data
+            pos += len(data)
+            if len(data) < count * bs:
+                # No more data available
+                break
+
+        del memory[pos:]
+        return bytes(memory)
 
     def get_system_information(self) -> dict[str, int]:
         """Get System information from card.
@@ -225,10 +409,8 @@ class ISO15693Card(Card):
         )
 
         if len(system_info) > 0 and system_info[0] & 1:
-            system_info += b"\0"
-            raise PN5180Error(
-                "Error getting system information", system_info[1]
-            )
+            code = system_info[1] if len(system_info) > 1 else 0
+            raise PN5180Error("Error getting system information", code)
         if len(system_info) < 1:
             raise PN5180Error("Error getting system information, no answer", 0)
 
@@ -238,22 +420,16 @@ class ISO15693Card(Card):
                 system_info[0],
             )
 
+        info_flags = system_info[1]
         pos = 10
         result = {}
-        if system_info[1] & 1:
-            result["dsfid"] = system_info[pos]
-            pos += 1
-        if system_info[1] & 2:
-            result["afi"] = system_info[pos]
-            pos += 1
-        if system_info[1] & 4:
-            result["num_blocks"] = system_info[pos] + 1
-            pos += 1
-            result["block_size"] = (system_info[pos] & 31) + 1
-            pos += 1
-        if system_info[1] & 8:
-            result["ic_reference"] = system_info[pos]
-            pos += 1
+        for flag, name in _SYS_INFO_FIELDS:
+            if info_flags & flag:
+                result[name] = system_info[pos]
+                pos += 1
+        if info_flags & 4:
+            result["num_blocks"] += 1
+            result["block_size"] = (result["block_size"] & 31) + 1
 
         return result
 
@@ -267,49 +443,94 @@ class ISO15693Card(Card):
         Raises:
             PN5180Error: If communication with the card fails.
         """
-        if offset % self.memory_block_size != 0:
+        bs = self.memory_block_size
+        if offset % bs != 0:
             raise ValueError(
                 "Offset not an even multiple of memory_block_size"
             )
 
-        if len(data) % self.memory_block_size != 0:
+        if len(data) % bs != 0:
             raise ValueError(
                 "data's length is not an even multiple of memory_block_size"
             )
 
-        start_block = offset // self.memory_block_size
+        start_block = offset // bs
 
-        num_blocks = len(data) // self.memory_block_size
+        num_blocks = len(data) // bs
 
         self._reader.turn_on_crc()
         self._reader.change_mode_to_transceiver()
 
-        ##### This should work, but some cards are incompatible...
-        # result = self._reader.send_and_receive_15693(
-        #    ISO15693Command.WRITE_MULTIPLE_BLOCKS,
-        #    bytes([
-        #        start_block,
-        #        num_blocks - 1,
-        #        ]) + data)
-
-        for block in range(num_blocks):
-            result = self._reader.send_and_receive_15693(
-                ISO15693Command.WRITE_SINGLE_BLOCK,
-                bytes(
-                    [
-                        block + start_block,
-                    ]
-                )
-                + data[
-                    block
-                    * self.memory_block_size : (block + 1)
-                    * self.memory_block_size
-                ],
+        blocks_per_write = max(1, _MAX_WRITE_LENGTH // bs)
+        end_block = start_block + num_blocks
+        block = start_block
+        while block < end_block:
+            count = min(blocks_per_write, end_block - block)
+            pos = (block - start_block) * bs
+            chunk = data[pos : pos + count * bs]
+            if not self._write_multiple_blocks(block, count, chunk):
+                self._write_single_blocks(block, chunk)
+            block += count
+
+    def _write_single_blocks(self, start_block: int, data: bytes) -> None:
+        """Write data with one (EXTENDED) WRITE SINGLE BLOCK per block."""
+        bs = self.memory_block_size
+        send_and_receive_15693 = self._reader.send_and_receive_15693
+        view = memoryview(data)
+        for i in range(len(data) // bs):
+            block = start_block + i
+            if block < 256:
+                command = _WRITE_SINGLE_BLOCK
+                parameters = bytes((block,))
+            else:
+                command = _EXTENDED_WRITE_SINGLE_BLOCK
+                parameters = _EXTENDED_BLOCK.pack(block)
+            result = send_and_receive_15693(
+                command, parameters + view[i * bs : (i + 1) * bs]
             )
             if len(result) < 1 or result[0] & 1:
-                result += b"\0\0"
                 raise MemoryWriteError(
-                    offset=block * self.memory_block_size,
-                    error_code=result[1],
-                    response_data=result,
+                    offset=block * bs,
+                    error_code=result[1] if len(result) > 1 else 0,
+                    response_data=bytes(result),
+                )
+
+    def _write_multiple_blocks(
+        self, start_block: int, num_blocks: int, data: bytes
+    ) -> bool:
+        """Try to write the blocks with one WRITE MULTIPLE BLOCKS command.
+
+        Returns:
+            True if the card wrote the blocks, False if they should be
+            written one at a time.
+        """
+        if num_blocks < 2 or len(data) > _MAX_WRITE_LENGTH:
+            return False
+
+        if not self._multiblock_ok:
+            return False
+
+        try:
+            if start_block + num_blocks > 256:
+                result = self._reader.send_and_receive_15693(
+                    _EXTENDED_WRITE_MULTIPLE_BLOCKS,
+                    _EXTENDED_BLOCK_RANGE.pack(start_block, num_blocks - 1)
+                    + data,
+                )
+            else:
+                result = self._reader.send_and_receive_15693(
+                    _WRITE_MULTIPLE_BLOCKS,
+                    _BLOCK_RANGE.pack(start_block, num_blocks - 1) + data,
                 )
+        except (ISO15693Error, TimeoutError) as e:
+            # Timeouts and block errors are retried one block at a time,
+            # only an unsupported command is remembered.
+            if (
+                isinstance(e, ISO15693Error)
+                and e.error_code in _UNSUPPORTED_COMMAND_ERRORS
+            ):
+                self._multiblock_ok = False
+            self._reader.change_mode_to_transceiver()
+            return False
+
+        return len(result) > 0
@@ -5,7 +5,7 @@
 
 from __future__ import annotations
 
-from typing import Any, cast
+from typing import Any
 
 from .cards import Iso15693UniqueId
 
@@ -31,6 +31,142 @@ from .constants import (
 
 MAX_TIMEOUT = 200  # Maximum time to wait for response
 
+# Valid op values in write_register_multiple elements.
+_REGISTER_OPS = frozenset(RegisterOperation)
+_SWITCH_MODES = frozenset(SwitchMode)
+_MIFARE_KEY_TYPES = frozenset(MifareKeyType)
+_TIMESLOT_BEHAVIORS = frozenset(TimeslotBehavior)
+
+# Plain int copies of the registers and ops used by the helpers.
+_SYSTEM_CONFIG = int(Registers.SYSTEM_CONFIG)
+_IRQ_ENABLE = int(Registers.IRQ_ENABLE)
+_IRQ_CLEAR = int(Registers.IRQ_CLEAR)
+_RX_STATUS = int(Registers.RX_STATUS)
+_CRC_RX_CONFIG = int(Registers.CRC_RX_CONFIG)
+_CRC_TX_CONFIG = int(Registers.CRC_TX_CONFIG)
+_SET = int(RegisterOperation.SET)
+_OR = int(RegisterOperation.OR)
+_AND = int(RegisterOperation.AND)
+
+# write_register_multiple elements for the helpers that change more than
+# one register field.
+_CRC_OFF_WRITES: list[tuple[int, int, int]] = [
+    # Clear RX_CRC_ENABLE and RX_BIT_ALIGN
+    (_CRC_RX_CONFIG, _AND, 0xFFFFFE3E),
+    (_CRC_TX_CONFIG, _AND, 0xFFFFFFFE),
+]
+_CRC_ON_WRITES: list[tuple[int, int, int]] = [
+    # Clear RX_BIT_ALIGN, set RX_CRC_ENABLE
+    (_CRC_RX_CONFIG, _AND, 0xFFFFFE3E),
+    (_CRC_RX_CONFIG, _OR, 0x00000001),
+    (_CRC_TX_CONFIG, _OR, 0x00000001),
+]
+_TRANSCEIVE_WRITES: list[tuple[int, int, int]] = [
+    # Set Idle state
+    (_SYSTEM_CONFIG, _AND, 0xFFFFFFF8),
+    # Initiates Transceiver state
+    (_SYSTEM_CONFIG, _OR, 0x00000003),
+]
+
+# Writing these registers makes the cached CRC state unknown.
+_CRC_REGISTERS = frozenset((_CRC_RX_CONFIG, _CRC_TX_CONFIG))
+
+# Plain configuration registers, writing them has no side effects.
+# Adjacent writes to them in one write_register_multiple can be folded.
+_FOLDABLE_REGISTERS = frozenset(
+    (
+        int(Registers.RX_WAIT_CONFIG),
+        _CRC_RX_CONFIG,
+        int(Registers.TX_WAIT_CONFIG),
+        int(Registers.TX_CONFIG),
+        _CRC_TX_CONFIG,
+    )
+)
+
+
+def _coalesce_register_ops(
+    elements: list[tuple[int, int, int]],
+) -> list[tuple[int, int, int]]:
+    """Drop no-op writes and fold adjacent writes to the same register.
+
+    Only _FOLDABLE_REGISTERS are changed. Writes to the other registers can
+    start commands or clear status bits and are kept as they are.
+    """
+    result: list[tuple[int, int, int]] = []
+    for addr, op, value in elements:
+        if addr in _FOLDABLE_REGISTERS:
+            if (op == _OR and value == 0) or (
+                op == _AND and value == 0xFFFFFFFF
+            ):
+                continue
+            if result and result[-1][0] == addr:
+                prev_op, prev_value = result[-1][1], result[-1][2]
+                if op == _SET:
+                    result[-1] = (addr, _SET, value)
+                    continue
+                if prev_op in (_SET, op):
+                    if op == _OR:
+                        prev_value |= value
+                    else:
+                        prev_value &= value
+                    result[-1] = (addr, prev_op, prev_value)
+                    continue
+        result.append((addr, op, value))
+    return result
+
+
+class _BufferedConnection:
+    """Serial connection wrapper that coalesces SimpleRPC's small I/O calls.
+
+    SimpleRPC writes the method index, every argument and every element
+    of a vector with separate ``write`` calls and reads the answer a few
+    bytes at a time, each of them a system call on the serial port.
+    Writes are collected until the answer is read (or :meth:`flush` is
+    called) and reads take whatever the port has already received.
+
+    Args:
+        connection: The pyserial connection to wrap.
+    """
+
+    def __init__(self, connection: Any) -> None:
+        """Initialize the wrapper around an opened connection."""
+        self._connection = connection
+        self._write_buffer = bytearray()
+        self._read_buffer = bytearray()
+
+    def write(self, data: bytes) -> int:
+        """Queue data to be written at the next flush."""
+        self._write_buffer += data
+        return len(data)
+
+    def flush(self) -> None:
+        """Write all queued data to the connection."""
+        if self._write_buffer:
+            self._connection.write(self._write_buffer)
+            self._write_buffer = bytearray()
+
+    def read(self, size: int = 1) -> bytes:
+        """Flush queued writes, then read up to size bytes."""
+        self.flush()
+        missing = size - len(self._read_buffer)
+        if missing > 0:
+            self._read_buffer += self._connection.read(
+                max(missing, self._connection.in_waiting)
+            )
+        data = bytes(self._read_buffer[:size])
+        del self._read_buffer[:size]
+        return data
+
+    def close(self) -> None:
+        """Flush queued writes and close the connection."""
+        self.flush()
+        self._read_buffer.clear()
+        self._connection.close()
+
+    def __getattr__(self, name: str) -> Any:
+        """Forward everything else to the wrapped connection."""
+        return getattr(self._connection, name)
+
 
 class PN5180Proxy:  # pylint: disable=too-many-public-methods
     """Low-level PN5180 RFID reader interface.
@@ -55,23 +191,71 @@ class PN5180Proxy:  # pylint: disable=too-many-public-methods
             tty: The tty device path to communicate via.
         """
         self._interface = Interface(tty)
+        # simple_rpc has no public API for its serial connection, the
+        # attribute is checked so that a changed simple_rpc fails clearly.
+        serial_connection = getattr(self._interface, "_connection", None)
+        if serial_connection is None or not hasattr(serial_connection, "read"):
+            raise RuntimeError(
+                "Unsupported arduino-simple-rpc version: "
+                "Interface._connection is not a serial connection"
+            )
+        self._set_low_latency(serial_connection)
+        self._connection = _BufferedConnection(serial_connection)
+        self._interface._connection = self._connection
+        # Bound once, these are called for every frame sent or received.
+        self._write_register = self._interface.write_register
+        self._write_register_multiple = self._interface.write_register_multiple
+        self._read_register = self._interface.read_register
+        self._send_data = self._interface.send_data
+        self._read_data = self._interface.read_data
+        self._wait_for_irq = self._interface.wait_for_irq
+        # True/False after turn_on_crc/turn_off_crc, None when unknown.
+        self._crc_on: bool | None = None
+
+    @staticmethod
+    def _set_low_latency(connection: Any) -> None:
+        """Ask the serial driver to deliver received bytes right away.
+
+        USB serial adapters otherwise wait up to 16 ms before passing on
+        the few bytes of an RPC answer. This only works on Linux serial
+        ports, elsewhere the default latency is kept.
+        """
+        try:
+            connection.set_low_latency_mode(True)
+        except (AttributeError, OSError, ValueError):
+            pass
+
+    @staticmethod
+    def _validate_register_elements(
+        elements: list[tuple[int, int, int]],
+    ) -> None:
+        """Raise ValueError for the first invalid register element."""
+        for i, (addr, op, value) in enumerate(elements):
+            PN5180Proxy._validate_uint8(addr, f"elements[{i}].address")
+            if op not in _REGISTER_OPS:
+                raise ValueError(
+                    f"elements[{i}].op must be RegisterOperation.SET (1), "
+                    f"OR (2), or AND (3)"
+                )
+            PN5180Proxy._validate_uint32(value, f"elements[{i}].value")
 
     @staticmethod
     def _validate_uint8(value: int, name: str) -> None:
         """Validate that a value is a valid uint8_t (0-255)."""
-        if not isinstance(value, int) or value < 0 or value > 255:
+        # Negative values have bits set outside the mask too.
+        if not isinstance(value, int) or value & ~0xFF:
             raise ValueError(f"{name} must be between 0 and 255")
 
     @staticmethod
     def _validate_uint16(value: int, name: str) -> None:
         """Validate that a value is a valid uint16_t (0-65535)."""
-        if not isinstance(value, int) or value < 0 or value > 65535:
+        if not isinstance(value, int) or value & ~0xFFFF:
             raise ValueError(f"{name} must be between 0 and 65535")
 
     @staticmethod
     def _validate_uint32(value: int, name: str) -> None:
         """Validate that a value is a valid uint32_t (0-2^32-1)."""
-        if not isinstance(value, int) or value < 0 or value > 4294967295:
+        if not isinstance(value, int) or value & ~0xFFFFFFFF:
             raise ValueError(f"{name} must be between 0 and 4294967295")
 
     # pylint: disable=no-member
@@ -82,7 +266,19 @@ class PN5180Proxy:  # pylint: disable=too-many-public-methods
         This method calls the reset function on the Arduino device,
         which performs a hardware reset of the PN5180 module.
         """
+        self.invalidate_crc_state()
         self._interface.reset()
+        # reset has no return value, so nothing reads (and flushes) it.
+        self._connection.flush()
+
+    def invalidate_crc_state(self) -> None:
+        """Forget the CRC state set by turn_on_crc/turn_off_crc.
+
+        The next turn_on_crc or turn_off_crc call then writes the CRC
+        registers again. Registers written through this class are
+        tracked already, call this if they were changed some other way.
+        """
+        self._crc_on = None
 
     def test_it(self) -> int:
         """Run a basic self-test on the PN5180 NFC frontend.
@@ -100,7 +296,8 @@ class PN5180Proxy:  # pylint: disable=too-many-public-methods
             Exception: Any communication or transport-related exception
                 raised by the underlying :class:`simple_rpc.Interface`.
         """
-        return cast(int, self._interface.test_it())
+        result: int = self._interface.test_it()
+        return result
 
     def write_register(self, addr: int, value: int) -> None:
         """Write to a PN5180 register.
@@ -114,10 +311,9 @@ class PN5180Proxy:  # pylint: disable=too-many-public-methods
         """
         self._validate_uint8(addr, "addr")
         self._validate_uint32(value, "value")
-        result = cast(
-            int,
-            self._interface.write_register(addr, value),
-        )
+        if addr in _CRC_REGISTERS:
+            self.invalidate_crc_state()
+        result: int = self._write_register(addr, value)
         if result < 0:
             raise PN5180Error("write_register", result)
 
@@ -133,10 +329,9 @@ class PN5180Proxy:  # pylint: disable=too-many-public-methods
         """
         self._validate_uint8(addr, "addr")
         self._validate_uint32(value, "value")
-        result = cast(
-            int,
-            self._interface.write_register_or_mask(addr, value),
-        )
+        if addr in _CRC_REGISTERS:
+            self.invalidate_crc_state()
+        result: int = self._interface.write_register_or_mask(addr, value)
         if result < 0:
             raise PN5180Error("write_register_or_mask", result)
 
@@ -152,10 +347,9 @@ class PN5180Proxy:  # pylint: disable=too-many-public-methods
         """
         self._validate_uint8(addr, "addr")
         self._validate_uint32(value, "value")
-        result = cast(
-            int,
-            self._interface.write_register_and_mask(addr, value),
-        )
+        if addr in _CRC_REGISTERS:
+            self.invalidate_crc_state()
+        result: int = self._interface.write_register_and_mask(addr, value)
         if result < 0:
             raise PN5180Error("write_register_and_mask", result)
 
@@ -173,19 +367,26 @@ class PN5180Proxy:  # pylint: disable=too-many-public-methods
         Raises:
             PN5180Error: If the operation fails.
         """
-        for i, (addr, op, value) in enumerate(elements):
-            self._validate_uint8(addr, f"elements[{i}].address")
-            if op not in (
-                RegisterOperation.SET,
-                RegisterOperation.OR,
-                RegisterOperation.AND,
+        if not elements:
+            addrs: tuple[int, ...] = ()
+        else:
+            addrs, ops, values = zip(*elements)
+            if not (
+                _REGISTER_OPS.issuperset(ops)
+                and all(isinstance(v, int) for v in addrs + values)
+                and 0 <= min(addrs)
+                and max(addrs) <= 255
+                and 0 <= min(values)
+                and max(values) <= 4294967295
             ):
-                raise ValueError(
-                    f"elements[{i}].op must be RegisterOperation.SET (1), "
-                    f"OR (2), or AND (3)"
-                )
-            self._validate_uint32(value, f"elements[{i}].value")
-        result = cast(int, self._interface.write_register_multiple(elements))
+                self._validate_register_elements(elements)
+        if not _CRC_REGISTERS.isdisjoint(addrs):
+            self.invalidate_crc_state()
+        if not _FOLDABLE_REGISTERS.isdisjoint(addrs):
+            elements = _coalesce_register_ops(elements)
+            if not elements:
+                return
+        result: int = self._write_register_multiple(elements)
         if result < 0:
             raise PN5180Error("write_register_multiple", result)
 
@@ -202,7 +403,7 @@ class PN5180Proxy:  # pylint: disable=too-many-public-methods
             PN5180Error: If the operation fails.
         """
         self._validate_uint8(addr, "addr")
-        result = cast(tuple[int, int], self._interface.read_register(addr))
+        result: tuple[int, int] = self._read_register(addr)
         if result[0] < 0:
             raise PN5180Error("read_register", result[0])
         return result[1]
@@ -221,11 +422,15 @@ class PN5180Proxy:  # pylint: disable=too-many-public-methods
         """
         if len(addrs) > 18:
             raise ValueError("addrs must contain at most 18 addresses")
-        for i, addr in enumerate(addrs):
-            self._validate_uint8(addr, f"addrs[{i}]")
-        result = cast(
-            tuple[int, list[int]],
-            self._interface.read_register_multiple(addrs),
+        if addrs and not (
+            all(isinstance(addr, int) for addr in addrs)
+            and 0 <= min(addrs)
+            and max(addrs) <= 255
+        ):
+            for i, addr in enumerate(addrs):
+                self._validate_uint8(addr, f"addrs[{i}]")
+        result: tuple[int, list[int]] = self._interface.read_register_multiple(
+            addrs
         )
         if result[0] < 0:
             raise PN5180Error("read_register_multiple", result[0])
@@ -244,7 +449,7 @@ class PN5180Proxy:  # pylint: disable=too-many-public-methods
         self._validate_uint8(addr, "addr")
         if len(values) > 255:
             raise ValueError("values must be at most 255 bytes")
-        result = cast(int, self._interface.write_eeprom(addr, list(values)))
+        result: int = self._interface.write_eeprom(addr, values)
         if result < 0:
             raise PN5180Error("write_eeprom", result)
 
@@ -279,7 +484,7 @@ class PN5180Proxy:  # pylint: disable=too-many-public-methods
         """
         if len(values) > 260:
             raise ValueError("values must be at most 260 bytes")
-        result = cast(int, self._interface.write_tx_data(list(values)))
+        result: int = self._interface.write_tx_data(values)
         if result < 0:
             raise PN5180Error("write_tx_data", result)
 
@@ -296,7 +501,7 @@ class PN5180Proxy:  # pylint: disable=too-many-public-methods
         self._validate_uint8(bits, "bits")
         if len(values) > 260:
             raise ValueError("values must be at most 260 bytes")
-        result = cast(int, self._interface.send_data(bits, list(values)))
+        result: int = self._send_data(bits, values)
         if result < 0:
             raise PN5180Error("send_data", result)
 
@@ -315,7 +520,7 @@ class PN5180Proxy:  # pylint: disable=too-many-public-methods
         self._validate_uint16(length, "length")
         if length > 508:
             raise ValueError("length must be at most 508")
-        result = self._interface.read_data(length)
+        result = self._read_data(length)
         if result[0] < 0:
             raise PN5180Error("read_data", result[0])
         return bytes(result[1])
@@ -330,18 +535,17 @@ class PN5180Proxy:  # pylint: disable=too-many-public-methods
         Raises:
             PN5180Error: If the operation fails.
         """
-        if mode not in (
-            SwitchMode.STANDBY,
-            SwitchMode.LPCD,
-            SwitchMode.AUTOCOLL,
-        ):
+        if mode not in _SWITCH_MODES:
             raise ValueError(
                 f"mode must be SwitchMode.STANDBY (0), LPCD (1), "
                 f"or AUTOCOLL (2), got {mode}"
             )
         for i, param in enumerate(params):
-            self._validate_uint8(param, f"params[{i}]")
-        result = cast(int, self._interface.switch_mode(mode, params))
+            if not isinstance(param, int) or not 0 <= param <= 255:
+                self._validate_uint8(param, f"params[{i}]")
+        # The PN5180 may change the CRC registers while running this.
+        self.invalidate_crc_state()
+        result: int = self._interface.switch_mode(mode, params)
         if result < 0:
             raise PN5180Error("switch_mode", result)
 
@@ -366,18 +570,17 @@ class PN5180Proxy:  # pylint: disable=too-many-public-methods
 
         if len(key) != 6:
             raise ValueError("key must be exactly 6 bytes")
-        if key_type not in (MifareKeyType.KEY_A, MifareKeyType.KEY_B):
+        if key_type not in _MIFARE_KEY_TYPES:
             raise ValueError(
                 f"key_type must be MifareKeyType.KEY_A (0x60) or "
                 f"MifareKeyType.KEY_B (0x61), got {key_type:#x}"
             )
         self._validate_uint8(block_addr, "block_addr")
         self._validate_uint32(mifare_uid, "mifare_uid")
-        result = cast(
-            int,
-            self._interface.mifare_authenticate(
-                list(key), key_type, block_addr, mifare_uid
-            ),
+        # The PN5180 may change the CRC registers while running this.
+        self.invalidate_crc_state()
+        result: int = self._interface.mifare_authenticate(
+            key, key_type, block_addr, mifare_uid
         )
         if result < 0:
             raise PN5180Error("mifare_authenticate", result)
@@ -411,24 +614,19 @@ class PN5180Proxy:  # pylint: disable=too-many-public-methods
         )
         if len(begin_round) != 3:
             raise ValueError("begin_round must be exactly 3 bytes")
-        if timeslot_behavior not in (
-            TimeslotBehavior.MAX_TIMESLOTS,
-            TimeslotBehavior.SINGLE_TIMESLOT,
-            TimeslotBehavior.SINGLE_WITH_HANDLE,
-        ):
+        if timeslot_behavior not in _TIMESLOT_BEHAVIORS:
             raise ValueError(
                 f"timeslot_behavior must be TimeslotBehavior.MAX_TIMESLOTS (0), "
                 f"SINGLE_TIMESLOT (1), or SINGLE_WITH_HANDLE (2), "
                 f"got {timeslot_behavior}"
             )
-        result = cast(
-            int,
-            self._interface.epc_inventory(
-                list(select_command),
-                select_command_final_bits,
-                list(begin_round),
-                timeslot_behavior,
-            ),
+        # The PN5180 may change the CRC registers while running this.
+        self.invalidate_crc_state()
+        result: int = self._interface.epc_inventory(
+            select_command,
+            select_command_final_bits,
+            begin_round,
+            timeslot_behavior,
         )
         if result < 0:
             raise PN5180Error("epc_inventory", result)
@@ -439,7 +637,9 @@ class PN5180Proxy:  # pylint: disable=too-many-public-methods
         Raises:
             PN5180Error: If the operation fails.
         """
-        result = cast(int, self._interface.epc_resume_inventory())
+        # The PN5180 may change the CRC registers while running this.
+        self.invalidate_crc_state()
+        result: int = self._interface.epc_resume_inventory()
         if result < 0:
             raise PN5180Error("epc_resume_inventory", result)
 
@@ -452,14 +652,30 @@ class PN5180Proxy:  # pylint: disable=too-many-public-methods
         Raises:
             PN5180Error: If the operation fails.
         """
-        result = cast(
-            int,
-            self._interface.epc_retrieve_inventory_result_size(),
-        )
+        result: int = self._interface.epc_retrieve_inventory_result_size()
         if result < 0:
             raise PN5180Error("epc_retrieve_inventory_result_size", result)
         return result
 
+    def epc_read_inventory_result(self) -> bytes:
+        """Get the result size from EPC algorithm and read the result.
+
+        This needs firmware with the epc_read_inventory_result RPC, see
+        has_rpc.
+
+        Returns:
+            The result bytes.
+
+        Raises:
+            PN5180Error: If the operation fails.
+        """
+        result: tuple[int, list[int]] = (
+            self._interface.epc_read_inventory_result()
+        )
+        if result[0] < 0:
+            raise PN5180Error("epc_read_inventory_result", result[0])
+        return bytes(result[1])
+
     def load_rf_config(
         self, tx_config: TxProtocol, rx_config: RxProtocol
     ) -> None:
@@ -474,10 +690,9 @@ class PN5180Proxy:  # pylint: disable=too-many-public-methods
         """
         self._validate_uint8(tx_config, "tx_config")
         self._validate_uint8(rx_config, "rx_config")
-        result = cast(
-            int,
-            self._interface.load_rf_config(tx_config, rx_config),
-        )
+        # The RF configuration includes the CRC registers.
+        self.invalidate_crc_state()
+        result: int = self._interface.load_rf_config(tx_config, rx_config)
         if result < 0:
             raise PN5180Error("load_rf_config", result)
 
@@ -500,7 +715,7 @@ class PN5180Proxy:  # pylint: disable=too-many-public-methods
             flags |= 0x01
         if use_active_communication:
             flags |= 0x02
-        result = cast(int, self._interface.rf_on(flags))
+        result: int = self._interface.rf_on(flags)
         if result < 0:
             raise PN5180Error("rf_on", result)
 
@@ -510,7 +725,7 @@ class PN5180Proxy:  # pylint: disable=too-many-public-methods
         Raises:
             PN5180Error: If the operation fails.
         """
-        result = cast(int, self._interface.rf_off())
+        result: int = self._interface.rf_off()
         if result < 0:
             raise PN5180Error("rf_off", result)
 
@@ -520,7 +735,8 @@ class PN5180Proxy:  # pylint: disable=too-many-public-methods
         Returns:
             True if IRQ is set.
         """
-        return cast(bool, self._interface.is_irq_set())
+        result: bool = self._interface.is_irq_set()
+        return result
 
     def wait_for_irq(self, timeout_ms: int) -> bool:
         """Wait up to a timeout value for the IRQ to be set.
@@ -532,10 +748,70 @@ class PN5180Proxy:  # pylint: disable=too-many-public-methods
             True if IRQ is set.
         """
         self._validate_uint16(timeout_ms, "timeout_ms")
-        return cast(
-            bool,
-            self._interface.wait_for_irq(timeout_ms),
+        result: bool = self._wait_for_irq(timeout_ms)
+        return result
+
+    def wait_and_read_rx(self, timeout_ms: int) -> tuple[bool, int, bytes]:
+        """Wait for the IRQ, then read RX_STATUS and the received data.
+
+        This needs firmware with the wait_and_read_rx RPC, see has_rpc.
+
+        Args:
+            timeout_ms: Time in milliseconds to wait (16-bit value: 0-65535).
+
+        Returns:
+            (True if IRQ is set, RX_STATUS value, received bytes).
+
+        Raises:
+            PN5180Error: If the operation fails.
+        """
+        self._validate_uint16(timeout_ms, "timeout_ms")
+        result: tuple[int, int, list[int]] = self._interface.wait_and_read_rx(
+            timeout_ms
+        )
+        if result[0] < 0:
+            raise PN5180Error("wait_and_read_rx", result[0])
+        return result[0] == 1, result[1], bytes(result[2])
+
+    def transceive(
+        self, bits: int, values: bytes, timeout_ms: int
+    ) -> tuple[bool, bytes]:
+        """Send data, then wait for the IRQ and read the received data.
+
+        This needs firmware with the transceive RPC, see has_rpc.
+
+        Args:
+            bits: Number of valid bits in final byte (byte: 0-255).
+            values: Up to 260 bytes to send.
+            timeout_ms: Time in milliseconds to wait (16-bit value: 0-65535).
+
+        Returns:
+            (True if an answer was received, received bytes).
+
+        Raises:
+            PN5180Error: If the operation fails.
+        """
+        self._validate_uint8(bits, "bits")
+        if len(values) > 260:
+            raise ValueError("values must be at most 260 bytes")
+        self._validate_uint16(timeout_ms, "timeout_ms")
+        result: tuple[int, list[int]] = self._interface.transceive(
+            bits, values, timeout_ms
         )
+        if result[0] < 0:
+            raise PN5180Error("transceive", result[0])
+        return result[0] == 1, bytes(result[1])
+
+    def has_rpc(self, name: str) -> bool:
+        """Check if the device's firmware has an RPC.
+
+        Args:
+            name: The RPC's name.
+
+        Returns:
+            True if the firmware has it.
+        """
+        return name in self._interface.device["methods"]
 
     def close(self) -> None:
         """Close the serial connection."""
@@ -564,7 +840,7 @@ class PN5180Helper(PN5180Proxy):
         Disables CRC verification for reception.
         """
         # Turn off CRC for RX
-        self.write_register_and_mask(Registers.CRC_RX_CONFIG, 0xFFFFFFFE)
+        self.write_register_and_mask(_CRC_RX_CONFIG, 0xFFFFFFFE)
 
     def turn_off_tx_crc(self) -> None:
         """Turn off CRC for TX.
@@ -572,15 +848,18 @@ class PN5180Helper(PN5180Proxy):
         Disables CRC calculation for transmission.
         """
         # Turn off CRC for TX
-        self.write_register_and_mask(Registers.CRC_TX_CONFIG, 0xFFFFFFFE)
+        self.write_register_and_mask(_CRC_TX_CONFIG, 0xFFFFFFFE)
 
     def turn_off_crc(self) -> None:
         """Turn off CRC for TX and RX. Sets RX_BIT_ALIGN to 0
 
         Disables CRC calculation and verification for transmission and reception.
+        Does nothing if turn_off_crc was the last change to the CRC registers.
         """
-        self.set_rx_crc_and_first_bit(False, 0)
-        self.turn_off_tx_crc()
+        if self._crc_on is False:
+            return
+        self.write_register_multiple(_CRC_OFF_WRITES)
+        self._crc_on = False
 
     def turn_on_rx_crc(self) -> None:
         """Turn on CRC for RX.
@@ -588,7 +867,7 @@ class PN5180Helper(PN5180Proxy):
         Enables CRC verification for reception.
         """
         # Turn on CRC for RX
-        self.write_register_or_mask(Registers.CRC_RX_CONFIG, 0x00000001)
+        self.write_register_or_mask(_CRC_RX_CONFIG, 0x00000001)
 
     def turn_on_tx_crc(self) -> None:
         """Turn on CRC for TX.
@@ -596,7 +875,7 @@ class PN5180Helper(PN5180Proxy):
         Enables CRC calculation for transmission.
         """
         # Turn on CRC for TX
-        self.write_register_or_mask(Registers.CRC_TX_CONFIG, 0x00000001)
+        self.write_register_or_mask(_CRC_TX_CONFIG, 0x00000001)
 
     def set_rx_crc_and_first_bit(self, on: bool, bit_start: int = 0) -> None:
         """Set RX_CRC_ENABLE and RX_BIT_ALIGN fields
@@ -605,46 +884,50 @@ class PN5180Helper(PN5180Proxy):
         sets the RX_BIT_ALIGN field as needed for the first
         received bits.
         """
-        self.write_register_and_mask(Registers.CRC_RX_CONFIG, 0xFFFFFE3E)
         flags = bit_start << 6
         if on:
             flags |= 1
-        self.write_register_or_mask(Registers.CRC_RX_CONFIG, flags)
+        self.write_register_multiple(
+            [
+                (_CRC_RX_CONFIG, _AND, 0xFFFFFE3E),
+                (_CRC_RX_CONFIG, _OR, flags),
+            ]
+        )
 
     def turn_on_crc(self) -> None:
         """Turn on CRC for TX and RX. Sets RX_BIT_ALIGN to 0
 
         Enables CRC calculation and verification for transmission and reception.
+        Does nothing if turn_on_crc was the last change to the CRC registers.
         """
-        self.set_rx_crc_and_first_bit(True, 0)
-        self.turn_on_tx_crc()
+        if self._crc_on is True:
+            return
+        self.write_register_multiple(_CRC_ON_WRITES)
+        self._crc_on = True
 
     def change_mode_to_transceiver(self) -> None:
         """Change PN5180 mode to transceiver.
 
         Sets the device to Idle state first, then initiates Transceiver state.
         """
-        # Set Idle state
-        self.write_register_and_mask(Registers.SYSTEM_CONFIG, 0xFFFFFFF8)
-        # Initiates Transceiver state
-        self.write_register_or_mask(Registers.SYSTEM_CONFIG, 0x00000003)
+        self.write_register_multiple(_TRANSCEIVE_WRITES)
 
     def clear_rx_irq(self) -> None:
         """Clear RX IRQ in IRQ_STATUS register."""
-        self.write_register(Registers.IRQ_CLEAR, 1)
+        self.write_register(_IRQ_CLEAR, 1)
 
     def enable_only_rx_irq(self) -> None:
         """Enable only RX IRQ in IRQ_ENABLE register."""
-        self.write_register(Registers.IRQ_ENABLE, 1)
+        self.write_register(_IRQ_ENABLE, 1)
 
     def disable_all_irqs(self) -> None:
         """Disable all IRQs in IRQ_ENABLE register."""
-        self.write_register(Registers.IRQ_ENABLE, 0)
+        self.write_register(_IRQ_ENABLE, 0)
 
     def get_rx_data_len(self) -> int:
         """Read the RX_STATUS register and get the length bits."""
         # TODO Verify other bits?
-        rx_status = self.read_register(Registers.RX_STATUS)
+        rx_status = self.read_register(_RX_STATUS)
         data_len = rx_status & 511
         return data_len
 
@@ -655,6 +938,41 @@ class PN5180Helper(PN5180Proxy):
             return b""
         return self.read_data(data_len)
 
+    def wait_for_received_data(self, timeout_ms: int) -> bytes:
+        """Wait for the IRQ, then return the received data.
+
+        With firmware that has the wait_and_read_rx RPC this is a single
+        round trip.
+
+        Args:
+            timeout_ms: Time in milliseconds to wait (16-bit value: 0-65535).
+
+        Returns:
+            Received data, empty bytes if the IRQ wasn't set or nothing
+            was received.
+        """
+        if self.has_rpc("wait_and_read_rx"):
+            return self.wait_and_read_rx(timeout_ms)[2]
+        if not self.wait_for_irq(timeout_ms):
+            return b""
+        return self.read_received_data()
+
+    def read_epc_inventory_result(self) -> bytes:
+        """Read the result of the EPC algorithm.
+
+        With firmware that has the epc_read_inventory_result RPC this is a
+        single round trip.
+
+        Returns:
+            The result bytes, empty bytes if there is no result.
+        """
+        if self.has_rpc("epc_read_inventory_result"):
+            return self.epc_read_inventory_result()
+        size = self.epc_retrieve_inventory_result_size()
+        if size == 0:
+            return b""
+        return self.read_data(size)
+
     def send_and_receive(self, bits: int, data: bytes) -> bytes:
         """Send data and receive response.
 
@@ -662,12 +980,21 @@ class PN5180Helper(PN5180Proxy):
             bits: Number of valid bits in final byte (byte: 0-255).
             data: Up to 260 bytes to send.
 
+        With firmware that has the transceive RPC this is a single round
+        trip.
+
         Returns:
             Received data as bytes. Empty bytes() if no data was received.
 
         Raises:
             PN5180Error: If communication fails.
         """
+        if self.has_rpc("transceive"):
+            answered, received = self.transceive(bits, data, MAX_TIMEOUT)
+            if not answered:
+                raise TimeoutError(f"No answer for {data[0]:x} request.")
+            return received
+
         self.clear_rx_irq()
         self.enable_only_rx_irq()
 
@@ -8,13 +8,70 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Any
 
 from .cards import Iso14443AUniqueId, Iso15693UniqueId
-from .constants import ISO14443ACommand, ISO15693Command, Registers
+from .constants import (
+    ISO14443ACommand,
+    ISO15693Command,
+    RegisterOperation,
+    Registers,
+)
 from .iso14443a import ISO14443ACard
 from .iso15693 import ISO15693Card
 
 if TYPE_CHECKING:
     from .proxy import PN5180Helper
 
+# How long to wait for a tag's answer in an ISO 15693 inventory slot, in ms.
+# The RX IRQ is set when the answer ends: the tag starts answering after
+# t1 = 4352/fc (~0.32 ms) and the answer (SOF, 96 bits, EOF) takes ~3.9 ms
+# at the high data rate of 26.48 kbit/s. Empty slots wait the full time.
+#
+# Slots 1-15 start with an EOF (~0.3 ms airtime), so the answer ends about
+# 0.3 + 0.32 + 3.9 = ~4.5 ms after it is sent. Slot 0 starts with the whole
+# INVENTORY request (~1.7 ms airtime with 1 out of 4 coding), so its answer
+# ends about 1.7 + 0.32 + 3.9 = ~6 ms after the request is sent. On top of
+# that, the timeout has to cover the 1 ms resolution of millis() in the
+# firmware and the USB latency between sending and waiting.
+_INVENTORY_FIRST_SLOT_TIMEOUT = 10
+_INVENTORY_SLOT_TIMEOUT = 7
+
+# Plain int copies of the registers and ops used in the inventory loop.
+_IRQ_CLEAR = int(Registers.IRQ_CLEAR)
+_TX_CONFIG = int(Registers.TX_CONFIG)
+_SYSTEM_CONFIG = int(Registers.SYSTEM_CONFIG)
+_SET = int(RegisterOperation.SET)
+_OR = int(RegisterOperation.OR)
+_AND = int(RegisterOperation.AND)
+
+# Register writes done between ISO 15693 inventory slots, as one
+# write_register_multiple call.
+_NEXT_SLOT_REGISTER_WRITES: list[tuple[int, int, int]] = [
+    # Clear RX IRQ
+    (_IRQ_CLEAR, _SET, 0x00000001),
+    # Clear bit 7, 8 and 11 - only send EOF for next command
+    (_TX_CONFIG, _AND, 0xFFFFFB3F),
+    # Set Idle state
+    (_SYSTEM_CONFIG, _AND, 0xFFFFFFF8),
+    # Initiates Transceiver state
+    (_SYSTEM_CONFIG, _OR, 0x00000003),
+]
+
+# Anticollision/select command byte for each cascade level.
+_CASCADE_LEVEL_CMDS = (
+    int(ISO14443ACommand.ANTICOLLISION_CL1),
+    int(ISO14443ACommand.ANTICOLLISION_CL2),
+    int(ISO14443ACommand.ANTICOLLISION_CL3),
+)
+
+# SELECT request prefix (SEL, NVB) for each cascade level.
+_SELECT_PREFIXES = tuple(
+    bytes([cmd, ISO14443ACommand.SELECT]) for cmd in _CASCADE_LEVEL_CMDS
+)
+
+
+def _bcc(uid_part: bytes | bytearray) -> int:
+    """Return the BCC (XOR) of a 4 byte UID part."""
+    return uid_part[0] ^ uid_part[1] ^ uid_part[2] ^ uid_part[3]
+
 
 class PN5180RFSession:
     """Manages RF communication session.
@@ -72,27 +129,26 @@ class PN5180RFSession:
         self._reader.turn_on_crc()
 
         uid = card_id.uid_as_bytes()
-        uid_list = list(uid)
         if len(uid) == 4:
-            sak = self._send_select_for_cl(0, uid_list)
+            sak = self._send_select_for_cl(0, uid)
             if len(sak) == 0:
                 return None
         else:
-            sak = self._send_select_for_part(0, uid_list[0:3])
+            sak = self._send_select_for_part(0, uid[0:3])
             if len(sak) == 0:
                 return None
 
             if len(uid) == 7:
-                sak = self._send_select_for_cl(1, uid_list[3:7])
+                sak = self._send_select_for_cl(1, uid[3:7])
                 if len(sak) == 0:
                     return None
             else:
-                sak = self._send_select_for_part(1, uid_list[3:6])
+                sak = self._send_select_for_part(1, uid[3:6])
                 if len(sak) == 0:
                     return None
 
             if len(uid) == 10:
-                sak = self._send_select_for_cl(2, uid_list[6:])
+                sak = self._send_select_for_cl(2, uid[6:])
                 if len(sak) == 0:
                     return None
 
@@ -103,8 +159,7 @@ class PN5180RFSession:
         """Verify BCC byte"""
         if len(data) != 5:
             return False
-        bcc = data[0] ^ data[1] ^ data[2] ^ data[3]
-        return bcc == data[4]
+        return _bcc(data) == data[4]
 
     def _get_coll_bit(self) -> None | int:
         """Get collision bit"""
@@ -118,13 +173,9 @@ class PN5180RFSession:
 
     @staticmethod
     def _get_cmd_for_level(level: int) -> int:
-        if level == 0:
-            return ISO14443ACommand.ANTICOLLISION_CL1
-        if level == 1:
-            return ISO14443ACommand.ANTICOLLISION_CL2
-        if level == 2:
-            return ISO14443ACommand.ANTICOLLISION_CL3
-        raise ValueError("level argument is out of range")
+        if not 0 <= level < len(_CASCADE_LEVEL_CMDS):
+            raise ValueError("level argument is out of range")
+        return _CASCADE_LEVEL_CMDS[level]
 
     def _get_one_iso14443a_card_id(self) -> Iso14443AUniqueId:
         """Get the UID of an ISO 14443-A card using anticollision protocol.
@@ -150,7 +201,7 @@ class PN5180RFSession:
     def _get_nvb_and_final_bits(
         data_len: int, coll_bit: int
     ) -> tuple[int, int]:
-        final_bits = coll_bit % 8
+        final_bits = coll_bit & 7
         nvb = ((data_len + 2) << 4) | final_bits
         if final_bits != 0:
             nvb -= 0x10
@@ -159,16 +210,16 @@ class PN5180RFSession:
     def _send_atqa(self) -> bytes:
         return self._reader.send_and_receive(7, bytes([ISO14443ACommand.WUPA]))
 
-    def _send_select_for_cl(self, cl: int, uid: list[int]) -> bytes:
-        bcc = uid[0] ^ uid[1] ^ uid[2] ^ uid[3]
-        sak = bytes([uid[0], uid[1], uid[2], uid[3], bcc])
-        cmd = self._get_cmd_for_level(cl)
-        request = bytes([cmd, ISO14443ACommand.SELECT]) + sak
+    def _send_select_for_cl(self, cl: int, uid: bytes | bytearray) -> bytes:
+        sak = bytes([uid[0], uid[1], uid[2], uid[3], _bcc(uid)])
+        request = _SELECT_PREFIXES[cl] + sak
         sak = self._reader.send_and_receive(0, request)
         return sak
 
-    def _send_select_for_part(self, cl: int, uid_part: list[int]) -> bytes:
-        return self._send_select_for_cl(cl, [0x88] + uid_part)
+    def _send_select_for_part(
+        self, cl: int, uid_part: bytes | bytearray
+    ) -> bytes:
+        return self._send_select_for_cl(cl, b"\x88" + uid_part)
 
     def get_all_iso14443a_uids(
         self,
@@ -200,8 +251,9 @@ class PN5180RFSession:
         # pylint: disable=too-many-statements
         # pylint: disable=too-many-branches
         card_ids: list[Iso14443AUniqueId] = []
-        discovery_stack: list[tuple[int, bytes, int, list[int], bool]] = [
-            (0, b"", 0, [], True),
+        # (cascade level, mask, collision bit, UID so far, restart)
+        discovery_stack: list[tuple[int, bytes, int, bytearray, bool]] = [
+            (0, b"", 0, bytearray(), True),
         ]
         while len(discovery_stack) > 0:
             cl, mask, coll_bit, uid, restart = discovery_stack.pop()
@@ -284,7 +336,7 @@ class PN5180RFSession:
 
                 self._reader.set_rx_crc_and_first_bit(True, 0)
                 self._reader.turn_on_tx_crc()
-                sak = self._send_select_for_cl(cl, list(new_mask)[0:4])
+                sak = self._send_select_for_cl(cl, new_mask[0:4])
                 if len(sak) == 0:
                     # TODO: Maybe have some maximum retry?
                     discovery_stack.append((cl, mask, coll_bit, uid, True))
@@ -293,9 +345,7 @@ class PN5180RFSession:
                 # Build UID
                 if sak[0] & (1 << 2) == 0:
                     uid.append(new_mask[0])
-                uid.append(new_mask[1])
-                uid.append(new_mask[2])
-                uid.append(new_mask[3])
+                uid.extend(new_mask[1:4])
                 if sak[0] & (1 << 2) == 0:
                     # All CL levels completed for this card
                     card_ids.append(Iso14443AUniqueId(bytes(uid), sak))
@@ -310,19 +360,25 @@ class PN5180RFSession:
                     discovery_stack.append((cl + 1, b"", 0, uid, False))
             else:
                 # There was a collision
-                n_bytes = 1 + (new_coll_bit + 7) // 8
-                bit = new_coll_bit % 8
+                n_bytes = 1 + ((new_coll_bit + 7) >> 3)
+                bit = new_coll_bit & 7
 
                 new_mask = bytearray(new_mask[:n_bytes])
 
-                new_mask[new_coll_bit // 8] |= 1 << bit
-                final_bit = (new_coll_bit + 1) % 8
+                new_mask[new_coll_bit >> 3] |= 1 << bit
+                final_bit = (new_coll_bit + 1) & 7
                 # Need to restart, another is handled next.
                 discovery_stack.append(
-                    (cl, bytes(new_mask[:n_bytes]), final_bit, list(uid), True)
+                    (
+                        cl,
+                        bytes(new_mask[:n_bytes]),
+                        final_bit,
+                        bytearray(uid),
+                        True,
+                    )
                 )
 
-                new_mask[new_coll_bit // 8] &= 255 ^ (1 << bit)
+                new_mask[new_coll_bit >> 3] &= 255 ^ (1 << bit)
                 # No need to restart, this is handled next.
                 discovery_stack.append(
                     (cl, bytes(new_mask[:n_bytes]), final_bit, uid, False)
@@ -372,6 +428,9 @@ class PN5180RFSession:
 
         stored_tx_config = self._reader.read_register(Registers.TX_CONFIG)
 
+        self._reader.clear_rx_irq()
+        self._reader.enable_only_rx_irq()
+
         # TODO Set flag according to slots
         self._reader.send_15693_request(
             ISO15693Command.INVENTORY,
@@ -380,44 +439,47 @@ class PN5180RFSession:
             afi=afi,
         )
 
+        reader = self._reader
+        wait_for_received_data = reader.wait_for_received_data
+        write_register_multiple = reader.write_register_multiple
+        send_data = reader.send_data
+
         # Loop through all slots
+        timeout = _INVENTORY_FIRST_SLOT_TIMEOUT
         for _ in range(slots):
             # Read response if available
-            rx_status = self._reader.read_register(Registers.RX_STATUS)
-            if rx_status:
-                how_many_bytes = rx_status & 511
-                if how_many_bytes > 0:
-                    data = self._reader.read_data(how_many_bytes)
-                    # Check if no error flag (bit 0 clear)
-                    if len(data) > 0 and (data[0] & 1) == 0:
-                        # UID is in bytes 10:1:-1 (reversed)
-                        if len(data) >= 10:
-                            uid = bytes(data[9:1:-1])
-                            card_ids.append(Iso15693UniqueId(uid))
-
-            # Prepare for next slot
-            # Clear bit 7, 8 and 11 - only send EOF for next command
-            self._reader.write_register_and_mask(
-                Registers.TX_CONFIG, 0xFFFFFB3F
-            )
-
-            # Set state to TRANSCEIVE
-            self._reader.change_mode_to_transceiver()
+            data = wait_for_received_data(timeout)
+            timeout = _INVENTORY_SLOT_TIMEOUT
+            # Check if no error flag (bit 0 clear)
+            if len(data) > 0 and (data[0] & 1) == 0:
+                # UID is in bytes 10:1:-1 (reversed)
+                if len(data) >= 10:
+                    uid = data[9:1:-1]
+                    card_ids.append(Iso15693UniqueId(uid))
+
+            # Prepare for next slot, set state to TRANSCEIVE
+            write_register_multiple(_NEXT_SLOT_REGISTER_WRITES)
 
             # Send EOF
-            self._reader.send_data(0, b"")
+            send_data(0, b"")
 
+        self._reader.disable_all_irqs()
         self._reader.write_register(Registers.TX_CONFIG, stored_tx_config)
 
         return card_ids
 
-    def connect_iso15693(self, card_id: Iso15693UniqueId) -> ISO15693Card:
+    def connect_iso15693(
+        self, card_id: Iso15693UniqueId, use_cache: bool = False
+    ) -> ISO15693Card:
         """Connect to an ISO 15693 card.
 
         This method selects an ISO 15693 card and returns
         a card object.
 
-        Args: card_id: A unique identifier for the card.
+        Args:
+            card_id: A unique identifier for the card.
+            use_cache: Keep the card's memory size in a cache
+                file, see ISO15693Card.
 
         Returns:
             ISO15693Card object representing the connected card.
@@ -437,7 +499,7 @@ class PN5180RFSession:
             ISO15693Command.SELECT, b"", uid=card_id
         )
 
-        return ISO15693Card(self._reader, card_id)
+        return ISO15693Card(self._reader, card_id, use_cache)
 
     def close(self) -> None:
         """Close the communication session and turn off RF field."""
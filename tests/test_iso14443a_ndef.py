@@ -312,3 +312,48 @@ def test_iso14443a_get_ndef_field_exceeds_memory(iso14443a_card):
     result = iso14443a_card.get_ndef(memory)
 
     assert result is None
+
+
+def test_iso14443a_write_memory(iso14443a_card):
+    """Test write_memory sends one WRITE per page."""
+    frames = []
+
+    def send_and_wait_for_ack(bits, data):
+        frames.append(bytes(data))
+        return b"\x0a"
+
+    iso14443a_card._reader.send_and_wait_for_ack.side_effect = (
+        send_and_wait_for_ack
+    )
+
+    iso14443a_card.write_memory(16, b"\xde\xad\xbe\xef\x01\x02\x03\x04")
+
+    assert frames == [
+        b"\xa2\x04\xde\xad\xbe\xef",
+        b"\xa2\x05\x01\x02\x03\x04",
+    ]
+
+
+def test_iso14443a_get_ndef_no_cc(iso14443a_card):
+    """Test get_ndef returns None when memory ends before the CC."""
+    memory = bytes([0x00] * 12 + [0xE1, 0x10])
+
+    result = iso14443a_card.get_ndef(memory)
+
+    assert result is None
+
+
+def test_iso14443a_mifare_authenticates_once_per_sector(iso14443a_card):
+    """Test reads within one MIFARE sector only authenticate once."""
+    reader = iso14443a_card._reader
+    reader.mifare_authenticate.return_value = 0
+    reader.send_and_receive.return_value = bytes(16)
+
+    # Pages 128-143 are all in the first 16 block sector of a 4K card.
+    assert iso14443a_card.read_memory(128 * 4, 64) == bytes(64)
+    assert reader.mifare_authenticate.call_count == 1
+
+    # Pages 0 and 4 are in different 4 block sectors.
+    reader.mifare_authenticate.reset_mock()
+    iso14443a_card.read_memory(0, 32)
+    assert reader.mifare_authenticate.call_count == 2
@@ -3,11 +3,18 @@
 
 """Tests for ISO15693 card functionality."""
 
+import json
 from unittest.mock import MagicMock
 
 import pytest
 
-from pn5180_tagomatic.iso15693 import ISO15693Card
+from pn5180_tagomatic.cards import Iso15693UniqueId
+from pn5180_tagomatic.constants import (
+    ISO15693Command,
+    ISO15693Error,
+    MemoryWriteError,
+)
+from pn5180_tagomatic.iso15693 import ISO15693Card, _iter_tlvs
 
 
 @pytest.fixture
@@ -270,6 +277,29 @@ def test_iso15693_get_ndef_memory_too_small(iso15693_card):
     assert result is None
 
 
+def test_iso15693_iter_tlvs():
+    """Test _iter_tlvs yields every TLV up to the terminator."""
+    memory = bytes(
+        [
+            0x00,  # NULL TLV
+            0xFD,
+            0x02,
+            0xAA,
+            0xBB,  # Proprietary TLV, length 2
+            0x03,
+            0xFF,
+            0x01,
+            0x00,  # NDEF TLV, 3-byte length 256
+        ]
+    )
+    memory += bytes(256) + bytes([0xFE, 0x03, 0x01, 0x00])
+
+    assert list(_iter_tlvs(memory, 0, len(memory))) == [
+        (0xFD, 3, 2),
+        (0x03, 9, 256),
+    ]
+
+
 def test_iso15693_get_ndef_field_exceeds_memory(iso15693_card):
     """Test get_ndef returns None when NDEF field exceeds memory length."""
     # NDEF field length exceeds available memory
@@ -292,3 +322,367 @@ def test_iso15693_get_ndef_field_exceeds_memory(iso15693_card):
     result = iso15693_card.get_ndef(memory)
 
     assert result is None
+
+
+def test_iso15693_system_information_read_once(iso15693_card):
+    """Test the system information is read once and then reused."""
+    iso15693_card._reader.send_and_receive_15693.return_value = bytes(
+        [0x00, 0x0F]  # No error, DSFID, AFI, memory size and IC ref
+        + [0x01, 0x02, 0x03, 0x04, 0x05, 0x06, 0x07, 0x08]  # UID
+        + [0x11, 0x22, 0x3F, 0x03, 0x44]
+    )
+
+    assert iso15693_card.memory_block_size == 4
+    assert iso15693_card.memory_number_of_blocks == 64
+    assert iso15693_card.dsfid == 0x11
+    assert iso15693_card.afi == 0x22
+    assert iso15693_card.ic_reference == 0x44
+    iso15693_card._reader.send_and_receive_15693.assert_called_once()
+
+
+def _sys_info_response(num_blocks: int, block_size: int) -> bytes:
+    """Build a GET_SYSTEM_INFORMATION answer with the memory size."""
+    return bytes(
+        [0x00, 0x04]
+        + [0x01, 0x02, 0x03, 0x04, 0x05, 0x06, 0x07, 0x08]
+        + [num_blocks - 1, block_size - 1]
+    )
+
+
+def test_iso15693_read_memory_in_chunks(iso15693_card):
+    """Test read_memory splits long reads in 128 byte commands."""
+    requests = []
+
+    def send_and_receive_15693(command, parameters, **kwargs):
+        if command == ISO15693Command.GET_SYSTEM_INFORMATION:
+            return _sys_info_response(256, 4)
+        requests.append((command, bytes(parameters)))
+        return b"\x00" + bytes([parameters[0]]) * ((parameters[1] + 1) * 4)
+
+    iso15693_card._reader.send_and_receive_15693.side_effect = (
+        send_and_receive_15693
+    )
+
+    memory = iso15693_card.read_memory(0, 160)
+
+    assert requests == [
+        (ISO15693Command.READ_MULTIPLE_BLOCKS, bytes([0, 31])),
+        (ISO15693Command.READ_MULTIPLE_BLOCKS, bytes([32, 7])),
+    ]
+    assert memory == bytes([0] * 128 + [32] * 32)
+
+
+def test_iso15693_read_memory_extended(iso15693_card):
+    """Test read_memory uses EXTENDED_READ_MULTIPLE_BLOCKS past block 255."""
+    requests = []
+
+    def send_and_receive_15693(command, parameters, **kwargs):
+        if command == ISO15693Command.GET_SYSTEM_INFORMATION:
+            return _sys_info_response(256, 4)
+        requests.append((command, bytes(parameters)))
+        return b"\x00" + b"\xab" * 8
+
+    iso15693_card._reader.send_and_receive_15693.side_effect = (
+        send_and_receive_15693
+    )
+
+    memory = iso15693_card.read_memory(300 * 4, 8)
+
+    assert requests == [
+        (
+            ISO15693Command.EXTENDED_READ_MULTIPLE_BLOCKS,
+            bytes([0x2C, 0x01, 0x01, 0x00]),
+        ),
+    ]
+    assert memory == b"\xab" * 8
+
+
+def test_iso15693_read_memory_stops_at_short_answer(iso15693_card):
+    """Test read_memory returns what was read when the card stops."""
+
+    def send_and_receive_15693(command, parameters, **kwargs):
+        if command == ISO15693Command.GET_SYSTEM_INFORMATION:
+            return _sys_info_response(256, 4)
+        return b"\x00" + b"\x11" * 12
+
+    iso15693_card._reader.send_and_receive_15693.side_effect = (
+        send_and_receive_15693
+    )
+
+    memory = iso15693_card.read_memory(0, 256)
+
+    assert memory == b"\x11" * 12
+    assert iso15693_card._reader.send_and_receive_15693.call_count == 2
+
+
+def _writable_card(uid: bytes, responses):
+    """Create a card with 4 byte blocks, answering writes from responses."""
+    reader = MagicMock()
+    requests = []
+
+    def send_and_receive_15693(command, parameters, **kwargs):
+        if command == ISO15693Command.GET_SYSTEM_INFORMATION:
+            return _sys_info_response(64, 4)
+        requests.append((command, bytes(parameters)))
+        response = responses(command)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    reader.send_and_receive_15693.side_effect = send_and_receive_15693
+    return ISO15693Card(reader, Iso15693UniqueId(uid)), requests
+
+
+def test_iso15693_write_memory_multiple_blocks():
+    """Test write_memory writes all blocks with one command."""
+    card, requests = _writable_card(b"\x10" * 8, lambda command: b"\x00")
+
+    card.write_memory(8, b"\x01\x02\x03\x04\x05\x06\x07\x08")
+
+    assert requests == [
+        (
+            ISO15693Command.WRITE_MULTIPLE_BLOCKS,
+            b"\x02\x01\x01\x02\x03\x04\x05\x06\x07\x08",
+        ),
+    ]
+
+
+def test_iso15693_write_memory_in_chunks():
+    """Test write_memory splits long writes in 128 byte commands."""
+    card, requests = _writable_card(b"\x13" * 8, lambda command: b"\x00")
+    data = bytes(range(200))
+
+    card.write_memory(8, data)
+
+    assert requests == [
+        (
+            ISO15693Command.WRITE_MULTIPLE_BLOCKS,
+            b"\x02\x1f" + data[:128],
+        ),
+        (
+            ISO15693Command.WRITE_MULTIPLE_BLOCKS,
+            b"\x22\x11" + data[128:],
+        ),
+    ]
+
+
+def test_iso15693_write_memory_in_chunks_falls_back_once():
+    """Test an unsupported WRITE MULTIPLE BLOCKS isn't tried per chunk."""
+
+    def responses(command):
+        if command == ISO15693Command.WRITE_MULTIPLE_BLOCKS:
+            return ISO15693Error(command, 0x01, b"\x01\x01")
+        return b"\x00"
+
+    card, requests = _writable_card(b"\x14" * 8, responses)
+
+    card.write_memory(0, bytes(200))
+
+    commands = [command for command, _ in requests]
+    assert (
+        commands
+        == [ISO15693Command.WRITE_MULTIPLE_BLOCKS]
+        + [ISO15693Command.WRITE_SINGLE_BLOCK] * 50
+    )
+    assert [parameters[0] for _, parameters in requests[1:]] == list(range(50))
+
+
+def test_iso15693_write_memory_extended():
+    """Test blocks above 255 are written with the EXTENDED commands."""
+
+    def responses(command):
+        if command == ISO15693Command.EXTENDED_WRITE_MULTIPLE_BLOCKS:
+            return ISO15693Error(command, 0x01, b"\x01\x01")
+        return b"\x00"
+
+    card, requests = _writable_card(b"\x15" * 8, responses)
+    data = bytes(range(16))
+
+    card.write_memory(254 * 4, data)
+
+    assert requests == [
+        (
+            ISO15693Command.EXTENDED_WRITE_MULTIPLE_BLOCKS,
+            b"\xfe\x00\x03\x00" + data,
+        ),
+        (ISO15693Command.WRITE_SINGLE_BLOCK, b"\xfe" + data[0:4]),
+        (ISO15693Command.WRITE_SINGLE_BLOCK, b"\xff" + data[4:8]),
+        (
+            ISO15693Command.EXTENDED_WRITE_SINGLE_BLOCK,
+            b"\x00\x01" + data[8:12],
+        ),
+        (
+            ISO15693Command.EXTENDED_WRITE_SINGLE_BLOCK,
+            b"\x01\x01" + data[12:16],
+        ),
+    ]
+
+
+def test_iso15693_write_memory_falls_back_to_single_blocks():
+    """Test write_memory writes block by block on cards without support."""
+
+    def responses(command):
+        if command == ISO15693Command.WRITE_MULTIPLE_BLOCKS:
+            return ISO15693Error(command, 0x01, b"\x01\x01")
+        return b"\x00"
+
+    card, requests = _writable_card(b"\x11" * 8, responses)
+
+    card.write_memory(8, b"\x01\x02\x03\x04\x05\x06\x07\x08")
+    card.write_memory(8, b"\x01\x02\x03\x04\x05\x06\x07\x08")
+
+    single_writes = [
+        (ISO15693Command.WRITE_SINGLE_BLOCK, b"\x02\x01\x02\x03\x04"),
+        (ISO15693Command.WRITE_SINGLE_BLOCK, b"\x03\x05\x06\x07\x08"),
+    ]
+    # The card is only asked once for WRITE MULTIPLE BLOCKS.
+    assert requests == [
+        (
+            ISO15693Command.WRITE_MULTIPLE_BLOCKS,
+            b"\x02\x01\x01\x02\x03\x04\x05\x06\x07\x08",
+        ),
+        *single_writes,
+        *single_writes,
+    ]
+
+
+def test_iso15693_write_memory_retries_multiple_blocks():
+    """Test only an unsupported command stops WRITE MULTIPLE BLOCKS."""
+    answers = [TimeoutError(), b"\x00"]
+
+    def responses(command):
+        if command == ISO15693Command.WRITE_MULTIPLE_BLOCKS:
+            return answers.pop(0)
+        return b"\x00"
+
+    card, requests = _writable_card(b"\x11" * 8, responses)
+
+    card.write_memory(8, b"\x01\x02\x03\x04\x05\x06\x07\x08")
+    card.write_memory(8, b"\x01\x02\x03\x04\x05\x06\x07\x08")
+
+    multiple_write = (
+        ISO15693Command.WRITE_MULTIPLE_BLOCKS,
+        b"\x02\x01\x01\x02\x03\x04\x05\x06\x07\x08",
+    )
+    assert requests == [
+        multiple_write,
+        (ISO15693Command.WRITE_SINGLE_BLOCK, b"\x02\x01\x02\x03\x04"),
+        (ISO15693Command.WRITE_SINGLE_BLOCK, b"\x03\x05\x06\x07\x08"),
+        multiple_write,
+    ]
+
+
+def test_iso15693_write_memory_empty_error_response():
+    """Test write_memory reports an empty answer without padding it."""
+    card, _ = _writable_card(b"\x12" * 8, lambda command: b"")
+
+    with pytest.raises(MemoryWriteError) as excinfo:
+        card.write_memory(0, b"\x01\x02\x03\x04")
+
+    assert excinfo.value.error_code == 0
+    assert excinfo.value.response_data == b""
+
+
+def test_iso15693_mode_set_up_per_command():
+    """Test CRC and transceive mode are set up for every command."""
+    card, _ = _writable_card(b"\x13" * 8, lambda command: b"\x00")
+    reader = card._reader
+
+    card.write_memory(0, b"\x01\x02\x03\x04")
+    card.write_memory(4, b"\x05\x06\x07\x08")
+    # Once more for the system information read by the first write.
+    assert reader.turn_on_crc.call_count == 3
+    assert reader.change_mode_to_transceiver.call_count == 3
+
+
+def test_iso15693_write_memory_error_offset():
+    """Test MemoryWriteError reports the card offset of the failed block."""
+
+    def responses(command):
+        if command == ISO15693Command.WRITE_MULTIPLE_BLOCKS:
+            return ISO15693Error(command, 0x01, b"\x01\x01")
+        if len(requests) == 3:
+            return b"\x01\x12"
+        return b"\x00"
+
+    card, requests = _writable_card(b"\x14" * 8, responses)
+
+    with pytest.raises(MemoryWriteError) as excinfo:
+        card.write_memory(8, b"\x01\x02\x03\x04\x05\x06\x07\x08")
+
+    assert excinfo.value.offset == 12
+    assert excinfo.value.error_code == 0x12
+
+
+def test_iso15693_sys_info_cache(tmp_path, monkeypatch):
+    """Test the persisted system information is used for a known card."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    uid = Iso15693UniqueId(b"\x15" * 8)
+
+    reader = MagicMock()
+    reader.send_and_receive_15693.return_value = _sys_info_response(64, 8)
+    assert ISO15693Card(reader, uid, use_cache=True).memory_block_size == 8
+    assert (tmp_path / "pn5180-tagomatic" / "sysinfo.json").exists()
+
+    reader = MagicMock()
+    card = ISO15693Card(reader, uid, use_cache=True)
+    assert card.memory_block_size == 8
+    assert card.memory_number_of_blocks == 64
+    reader.send_and_receive_15693.assert_not_called()
+    assert [p.name for p in (tmp_path / "pn5180-tagomatic").iterdir()] == [
+        "sysinfo.json"
+    ]
+
+
+def test_iso15693_sys_info_cache_skips_dsfid_and_afi(tmp_path, monkeypatch):
+    """Test DSFID and AFI are not persisted but read from the card."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    uid = Iso15693UniqueId(b"\x17" * 8)
+    # All fields: DSFID 0x11, AFI 0x22, 64 blocks of 8 bytes, IC ref 0x33.
+    response = bytes(
+        [0x00, 0x0F]
+        + [0x01, 0x02, 0x03, 0x04, 0x05, 0x06, 0x07, 0x08]
+        + [0x11, 0x22, 63, 7, 0x33]
+    )
+
+    reader = MagicMock()
+    reader.send_and_receive_15693.return_value = response
+    assert ISO15693Card(reader, uid, use_cache=True).memory_block_size == 8
+    cache_file = tmp_path / "pn5180-tagomatic" / "sysinfo.json"
+    assert json.loads(cache_file.read_text()) == {
+        uid.uid_as_bytes().hex(): {
+            "num_blocks": 64,
+            "block_size": 8,
+            "ic_reference": 0x33,
+        }
+    }
+
+    reader = MagicMock()
+    reader.send_and_receive_15693.return_value = response
+    card = ISO15693Card(reader, uid, use_cache=True)
+    assert card.ic_reference == 0x33
+    reader.send_and_receive_15693.assert_not_called()
+    assert card.afi == 0x22
+    assert card.dsfid == 0x11
+    assert reader.send_and_receive_15693.call_count == 2
+
+
+def test_iso15693_sys_info_cache_bad_entry(tmp_path, monkeypatch):
+    """Test a malformed persisted entry is ignored and replaced."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    uid = Iso15693UniqueId(b"\x16" * 8)
+    cache_file = tmp_path / "pn5180-tagomatic" / "sysinfo.json"
+    cache_file.parent.mkdir()
+
+    for entry in (
+        "x",
+        {"block_size": "8"},
+        {"block_size": 0},
+        {"oops": 1},
+        {"afi": 1},
+    ):
+        cache_file.write_text(json.dumps({uid.uid_as_bytes().hex(): entry}))
+        reader = MagicMock()
+        reader.send_and_receive_15693.return_value = _sys_info_response(64, 8)
+        assert ISO15693Card(reader, uid, use_cache=True).memory_block_size == 8
+        reader.send_and_receive_15693.assert_called_once()
@@ -5,7 +5,15 @@
 
 from unittest.mock import MagicMock, Mock, call, patch
 
-from pn5180_tagomatic import PN5180, Registers
+import pytest
+
+from pn5180_tagomatic import PN5180, RegisterOperation, Registers
+from pn5180_tagomatic.proxy import (
+    PN5180Proxy,
+    _BufferedConnection,
+    _coalesce_register_ops,
+)
+from pn5180_tagomatic.session import PN5180RFSession, _bcc
 
 
 @patch("pn5180_tagomatic.proxy.Interface")
@@ -17,6 +25,77 @@ def test_pn5180_init(mock_interface_class: Mock) -> None:
     mock_interface_class.assert_called_once_with(tty)
 
 
+@patch("pn5180_tagomatic.proxy.Interface")
+def test_pn5180_unsupported_simple_rpc(mock_interface_class: Mock) -> None:
+    """Test a simple_rpc without the expected connection fails clearly."""
+    mock_interface = MagicMock()
+    del mock_interface._connection
+    mock_interface_class.return_value = mock_interface
+
+    with pytest.raises(RuntimeError, match="arduino-simple-rpc"):
+        PN5180Proxy("/dev/ttyACM0")
+
+
+@patch("pn5180_tagomatic.proxy.Interface")
+def test_pn5180_low_latency(mock_interface_class: Mock) -> None:
+    """Test that low latency mode is requested, but not required."""
+    mock_interface = MagicMock()
+    mock_interface_class.return_value = mock_interface
+    serial = mock_interface._connection
+
+    PN5180Proxy("/dev/ttyACM0")
+    serial.set_low_latency_mode.assert_called_once_with(True)
+
+    serial.set_low_latency_mode.side_effect = ValueError("not supported")
+    PN5180Proxy("/dev/ttyACM0")
+
+
+def test_buffered_connection_coalesces_writes() -> None:
+    """Test that writes are sent in one call when the answer is read."""
+    serial = MagicMock()
+    serial.in_waiting = 0
+    serial.read.return_value = b"\x00\x00"
+    connection = _BufferedConnection(serial)
+
+    connection.write(b"\x02")
+    connection.write(b"\x10")
+    connection.write(b"\x01\x00\x00\x00")
+    serial.write.assert_not_called()
+
+    assert connection.read(2) == b"\x00\x00"
+    serial.write.assert_called_once_with(bytearray(b"\x02\x10\x01\0\0\0"))
+
+
+def test_buffered_connection_reads_ahead() -> None:
+    """Test that bytes already received are read in one call."""
+    serial = MagicMock()
+    serial.in_waiting = 5
+    serial.read.return_value = b"\x00\x01\x02\x03\x04"
+    connection = _BufferedConnection(serial)
+
+    assert connection.read(1) == b"\x00"
+    assert connection.read(2) == b"\x01\x02"
+    assert connection.read(2) == b"\x03\x04"
+    serial.read.assert_called_once_with(5)
+
+
+@patch("pn5180_tagomatic.proxy.Interface")
+def test_pn5180_reset_flushes_writes(mock_interface_class: Mock) -> None:
+    """Test that reset, which has no answer, is written at once."""
+    mock_interface = MagicMock()
+    serial = mock_interface._connection
+    mock_interface_class.return_value = mock_interface
+    reader = PN5180("/dev/ttyACM0")
+
+    def reset() -> None:
+        mock_interface._connection.write(b"\x00")
+
+    mock_interface.reset.side_effect = reset
+    reader.ll.reset()
+
+    serial.write.assert_called_once_with(bytearray(b"\x00"))
+
+
 @patch("pn5180_tagomatic.proxy.Interface")
 def test_pn5180_reset(mock_interface_class: Mock) -> None:
     """Test PN5180 reset method via ll."""
@@ -56,22 +135,46 @@ def test_pn5180_context_manager(mock_interface_class: Mock) -> None:
     mock_interface.close.assert_called_once()
 
 
+@patch("pn5180_tagomatic.proxy.Interface")
+def test_write_register_multiple_validates_elements(
+    mock_interface_class: Mock,
+) -> None:
+    """Test that a bad element is reported by its index."""
+    mock_interface = MagicMock()
+    mock_interface.write_register_multiple.return_value = 0
+    mock_interface_class.return_value = mock_interface
+    reader = PN5180("/dev/ttyACM0")
+
+    good = (Registers.TX_CONFIG, RegisterOperation.SET, 0xFFFFFFFF)
+    reader.ll.write_register_multiple([good, good])
+    mock_interface.write_register_multiple.assert_called_once()
+
+    with pytest.raises(ValueError, match=r"elements\[1\]\.address"):
+        reader.ll.write_register_multiple([good, (256, 1, 0)])
+    with pytest.raises(ValueError, match=r"elements\[0\]\.op"):
+        reader.ll.write_register_multiple([(0, 4, 0)])
+    with pytest.raises(ValueError, match=r"elements\[1\]\.value"):
+        reader.ll.write_register_multiple([good, (0, 1, -1)])
+    assert mock_interface.write_register_multiple.call_count == 1
+
+
 @patch("pn5180_tagomatic.proxy.Interface")
 def test_turn_off_crc(mock_interface_class: Mock) -> None:
     """Test turn_off_crc method via ll."""
     tty = "/dev/ttyACM0"
     mock_interface = MagicMock()
-    mock_interface.write_register_and_mask.return_value = 0
-    mock_interface.write_register_or_mask.return_value = 0
+    mock_interface.write_register_multiple.return_value = 0
     mock_interface_class.return_value = mock_interface
 
     reader = PN5180(tty)
     reader.ll.turn_off_crc()
 
-    assert mock_interface.write_register_and_mask.call_count == 2
-    calls = mock_interface.write_register_and_mask.call_args_list
-    assert call(Registers.CRC_TX_CONFIG, 0xFFFFFFFE) in calls
-    assert call(Registers.CRC_RX_CONFIG, 0xFFFFFE3E) in calls
+    mock_interface.write_register_multiple.assert_called_once_with(
+        [
+            (Registers.CRC_RX_CONFIG, 3, 0xFFFFFE3E),
+            (Registers.CRC_TX_CONFIG, 3, 0xFFFFFFFE),
+        ]
+    )
 
 
 @patch("pn5180_tagomatic.proxy.Interface")
@@ -79,17 +182,53 @@ def test_turn_on_crc(mock_interface_class: Mock) -> None:
     """Test turn_on_crc method via ll."""
     tty = "/dev/ttyACM0"
     mock_interface = MagicMock()
-    mock_interface.write_register_and_mask.return_value = 0
-    mock_interface.write_register_or_mask.return_value = 0
+    mock_interface.write_register_multiple.return_value = 0
     mock_interface_class.return_value = mock_interface
 
     reader = PN5180(tty)
     reader.ll.turn_on_crc()
 
-    assert mock_interface.write_register_or_mask.call_count == 2
-    calls = mock_interface.write_register_or_mask.call_args_list
-    assert call(Registers.CRC_TX_CONFIG, 0x00000001) in calls
-    assert call(Registers.CRC_RX_CONFIG, 0x00000001) in calls
+    mock_interface.write_register_multiple.assert_called_once_with(
+        [
+            (Registers.CRC_RX_CONFIG, 3, 0xFFFFFE3E),
+            (Registers.CRC_RX_CONFIG, 2, 0x00000001),
+            (Registers.CRC_TX_CONFIG, 2, 0x00000001),
+        ]
+    )
+
+
+@patch("pn5180_tagomatic.proxy.Interface")
+def test_turn_on_crc_skips_when_on(mock_interface_class: Mock) -> None:
+    """Test turn_on_crc only writes the registers when CRC may be off."""
+    mock_interface = MagicMock()
+    mock_interface.write_register_and_mask.return_value = 0
+    mock_interface.write_register_multiple.return_value = 0
+    mock_interface_class.return_value = mock_interface
+
+    reader = PN5180("/dev/ttyACM0")
+    reader.ll.turn_on_crc()
+    reader.ll.turn_on_crc()
+    assert mock_interface.write_register_multiple.call_count == 1
+
+    # Changing a CRC register directly forgets the state.
+    reader.ll.turn_off_rx_crc()
+    reader.ll.turn_on_crc()
+    assert mock_interface.write_register_multiple.call_count == 2
+
+    reader.ll.invalidate_crc_state()
+    reader.ll.turn_on_crc()
+    assert mock_interface.write_register_multiple.call_count == 3
+
+    # Commands run by the PN5180 may change the CRC registers.
+    mock_interface.mifare_authenticate.return_value = 0
+    reader.ll.mifare_authenticate(bytes(6), 0x60, 4, 0x01020304)
+    reader.ll.turn_on_crc()
+    assert mock_interface.write_register_multiple.call_count == 4
+
+    mock_interface.switch_mode.return_value = 0
+    reader.ll.switch_mode(0, [0, 0, 0])
+    reader.ll.turn_on_crc()
+    assert mock_interface.write_register_multiple.call_count == 5
 
 
 @patch("pn5180_tagomatic.proxy.Interface")
@@ -97,18 +236,17 @@ def test_change_mode_to_transceiver(mock_interface_class: Mock) -> None:
     """Test change_mode_to_transceiver method via ll."""
     tty = "/dev/ttyACM0"
     mock_interface = MagicMock()
-    mock_interface.write_register_and_mask.return_value = 0
-    mock_interface.write_register_or_mask.return_value = 0
+    mock_interface.write_register_multiple.return_value = 0
     mock_interface_class.return_value = mock_interface
 
     reader = PN5180(tty)
     reader.ll.change_mode_to_transceiver()
 
-    mock_interface.write_register_and_mask.assert_called_once_with(
-        Registers.SYSTEM_CONFIG, 0xFFFFFFF8
-    )
-    mock_interface.write_register_or_mask.assert_called_once_with(
-        Registers.SYSTEM_CONFIG, 0x00000003
+    mock_interface.write_register_multiple.assert_called_once_with(
+        [
+            (Registers.SYSTEM_CONFIG, 3, 0xFFFFFFF8),
+            (Registers.SYSTEM_CONFIG, 2, 0x00000003),
+        ]
     )
 
 
@@ -165,6 +303,7 @@ def test_connect_iso14443a(mock_interface_class: Mock) -> None:
     mock_interface.write_register_and_mask.return_value = 0
     mock_interface.write_register_or_mask.return_value = 0
     mock_interface.write_register.return_value = 0
+    mock_interface.write_register_multiple.return_value = 0
     mock_interface.send_data.return_value = 0
     mock_interface.wait_for_irq.return_value = True
 
@@ -202,6 +341,7 @@ def test_card_read_memory(mock_interface_class: Mock) -> None:
     mock_interface.write_register_and_mask.return_value = 0
     mock_interface.write_register_or_mask.return_value = 0
     mock_interface.write_register.return_value = 0
+    mock_interface.write_register_multiple.return_value = 0
     mock_interface.send_data.return_value = 0
     mock_interface.wait_for_irq.return_value = True
     mock_interface.mifare_authenticate.return_value = 0  # Success
@@ -248,6 +388,7 @@ def test_card_read_mifare_memory(mock_interface_class: Mock) -> None:
     mock_interface.write_register_and_mask.return_value = 0
     mock_interface.write_register_or_mask.return_value = 0
     mock_interface.write_register.return_value = 0
+    mock_interface.write_register_multiple.return_value = 0
     mock_interface.send_data.return_value = 0
     mock_interface.wait_for_irq.return_value = True
     mock_interface.mifare_authenticate.return_value = 0  # Success
@@ -276,3 +417,193 @@ def test_card_read_mifare_memory(mock_interface_class: Mock) -> None:
         assert len(memory) == 16
         assert memory == bytes([0xCC] * 16)
         mock_interface.mifare_authenticate.assert_called()
+
+
+@patch("pn5180_tagomatic.proxy.Interface")
+def test_iso15693_inventory(mock_interface_class: Mock) -> None:
+    """Test ISO 15693 inventory with one tag answering in the first slot."""
+    tty = "/dev/ttyACM0"
+    mock_interface = MagicMock()
+    mock_interface_class.return_value = mock_interface
+    mock_interface.load_rf_config.return_value = 0
+    mock_interface.rf_on.return_value = 0
+    mock_interface.rf_off.return_value = 0
+    mock_interface.write_register.return_value = 0
+    mock_interface.write_register_and_mask.return_value = 0
+    mock_interface.write_register_or_mask.return_value = 0
+    mock_interface.write_register_multiple.return_value = 0
+    mock_interface.send_data.return_value = 0
+    mock_interface.wait_for_irq.side_effect = [True] + [False] * 15
+
+    uid = bytes([0xE0, 0x04, 0x01, 0x02, 0x03, 0x04, 0x05, 0x06])
+    mock_interface.read_register.side_effect = [
+        (0, 0x00000078),  # TX_CONFIG
+        (0, 10),  # RX_STATUS, slot 0
+    ]
+    mock_interface.read_data.side_effect = [
+        (0, [0x00, 0x00] + list(uid[::-1])),
+    ]
+
+    reader = PN5180(tty)
+    with reader.start_session(0x0D, 0x8D) as session:
+        card_ids = session.iso15693_inventory()
+
+    assert [card_id.uid_as_bytes() for card_id in card_ids] == [uid]
+    # Slot 0 also has to wait for the INVENTORY request to be sent.
+    timeouts = [c.args[0] for c in mock_interface.wait_for_irq.call_args_list]
+    assert timeouts == [10] + [7] * 15
+    # RX_STATUS is only read for the slot that got an answer.
+    assert mock_interface.read_register.call_count == 2
+    next_slot = call(
+        [
+            (Registers.IRQ_CLEAR, 1, 0x00000001),
+            (Registers.TX_CONFIG, 3, 0xFFFFFB3F),
+            (Registers.SYSTEM_CONFIG, 3, 0xFFFFFFF8),
+            (Registers.SYSTEM_CONFIG, 2, 0x00000003),
+        ]
+    )
+    calls = mock_interface.write_register_multiple.call_args_list
+    assert calls.count(next_slot) == 16
+    assert calls[-1] == next_slot
+    mock_interface.write_register.assert_called_with(
+        Registers.TX_CONFIG, 0x00000078
+    )
+
+
+@patch("pn5180_tagomatic.proxy.Interface")
+def test_iso15693_inventory_wait_and_read_rx(
+    mock_interface_class: Mock,
+) -> None:
+    """Test ISO 15693 inventory with the wait_and_read_rx firmware RPC."""
+    mock_interface = MagicMock()
+    mock_interface_class.return_value = mock_interface
+    mock_interface.device = {"methods": {"wait_and_read_rx": {}}}
+    mock_interface.load_rf_config.return_value = 0
+    mock_interface.rf_on.return_value = 0
+    mock_interface.rf_off.return_value = 0
+    mock_interface.write_register.return_value = 0
+    mock_interface.write_register_and_mask.return_value = 0
+    mock_interface.write_register_or_mask.return_value = 0
+    mock_interface.write_register_multiple.return_value = 0
+    mock_interface.send_data.return_value = 0
+    mock_interface.read_register.return_value = (0, 0x00000078)
+
+    uid = bytes([0xE0, 0x04, 0x01, 0x02, 0x03, 0x04, 0x05, 0x06])
+    mock_interface.wait_and_read_rx.side_effect = [
+        (1, 10, [0x00, 0x00] + list(uid[::-1])),
+    ] + [(0, 0, [])] * 15
+
+    reader = PN5180("/dev/ttyACM0")
+    with reader.start_session(0x0D, 0x8D) as session:
+        card_ids = session.iso15693_inventory()
+
+    assert [card_id.uid_as_bytes() for card_id in card_ids] == [uid]
+    assert mock_interface.wait_and_read_rx.call_count == 16
+    mock_interface.wait_for_irq.assert_not_called()
+    mock_interface.read_data.assert_not_called()
+    # Only TX_CONFIG is read, to be restored afterwards.
+    assert mock_interface.read_register.call_count == 1
+
+
+def test_coalesce_register_ops() -> None:
+    """Test folding of register writes before write_register_multiple."""
+    tx = Registers.TX_CONFIG
+    crc = Registers.CRC_RX_CONFIG
+    set_, or_, and_ = (
+        RegisterOperation.SET,
+        RegisterOperation.OR,
+        RegisterOperation.AND,
+    )
+    assert _coalesce_register_ops(
+        [(tx, or_, 0), (tx, and_, 0xFFFFFFFF), (crc, or_, 1)]
+    ) == [(crc, or_, 1)]
+    assert _coalesce_register_ops(
+        [(tx, set_, 0xF0), (tx, or_, 0x01), (tx, and_, 0x31)]
+    ) == [(tx, set_, 0x31)]
+    assert _coalesce_register_ops([(tx, and_, 0xF0), (tx, and_, 0x3C)]) == [
+        (tx, and_, 0x30)
+    ]
+    assert _coalesce_register_ops([(tx, or_, 0x01), (tx, or_, 0x02)]) == [
+        (tx, or_, 0x03)
+    ]
+    assert _coalesce_register_ops([(tx, and_, 0xF0), (tx, set_, 0x05)]) == [
+        (tx, set_, 0x05)
+    ]
+    # AND followed by OR needs both writes.
+    assert _coalesce_register_ops([(crc, and_, 0xFE), (crc, or_, 0x01)]) == [
+        (crc, and_, 0xFE),
+        (crc, or_, 0x01),
+    ]
+    # Writes to registers with side effects are left as they are.
+    system = Registers.SYSTEM_CONFIG
+    irq_clear = Registers.IRQ_CLEAR
+    elements = [
+        (irq_clear, set_, 1),
+        (irq_clear, set_, 1),
+        (system, and_, 0xFFFFFFF8),
+        (system, or_, 0x00000003),
+        (system, or_, 0),
+    ]
+    assert _coalesce_register_ops(elements) == elements
+
+
+@patch("pn5180_tagomatic.proxy.Interface")
+def test_send_and_receive_transceive(mock_interface_class: Mock) -> None:
+    """Test send_and_receive with the transceive firmware RPC."""
+    mock_interface = MagicMock()
+    mock_interface_class.return_value = mock_interface
+    mock_interface.device = {"methods": {"transceive": {}}}
+    mock_interface.transceive.side_effect = [
+        (1, [0x01, 0x02, 0x03]),
+        (0, []),
+    ]
+
+    reader = PN5180("/dev/ttyACM0")
+    assert reader.ll.send_and_receive(0, b"\x30\x04") == b"\x01\x02\x03"
+    mock_interface.transceive.assert_called_with(0, b"\x30\x04", 200)
+    mock_interface.send_data.assert_not_called()
+    mock_interface.wait_for_irq.assert_not_called()
+
+    with pytest.raises(TimeoutError):
+        reader.ll.send_and_receive(0, b"\x30\x04")
+
+
+@patch("pn5180_tagomatic.proxy.Interface")
+def test_read_epc_inventory_result(mock_interface_class: Mock) -> None:
+    """Test reading the EPC result with and without the combined RPC."""
+    mock_interface = MagicMock()
+    mock_interface_class.return_value = mock_interface
+    mock_interface.epc_retrieve_inventory_result_size.return_value = 2
+    mock_interface.read_data.return_value = (0, [0x12, 0x34])
+
+    reader = PN5180("/dev/ttyACM0")
+    assert reader.ll.read_epc_inventory_result() == b"\x12\x34"
+    mock_interface.read_data.assert_called_once_with(2)
+
+    mock_interface.device = {"methods": {"epc_read_inventory_result": {}}}
+    mock_interface.epc_read_inventory_result.return_value = (0, [0x56])
+    assert reader.ll.read_epc_inventory_result() == b"\x56"
+    assert mock_interface.epc_retrieve_inventory_result_size.call_count == 1
+
+
+def test_validate_uint_ranges() -> None:
+    """Test the unsigned integer validators at their limits."""
+    for validate, top in (
+        (PN5180Proxy._validate_uint8, 0xFF),
+        (PN5180Proxy._validate_uint16, 0xFFFF),
+        (PN5180Proxy._validate_uint32, 0xFFFFFFFF),
+    ):
+        validate(0, "value")
+        validate(top, "value")
+        for bad in (-1, top + 1, 1.0, "1"):
+            with pytest.raises(ValueError, match="value must be between"):
+                validate(bad, "value")  # type: ignore[arg-type]
+
+
+def test_bcc() -> None:
+    """Test the BCC of a UID part and its check."""
+    assert _bcc(b"\x01\x02\x03\x04") == 0x04
+    assert _bcc([0x88, 0x04, 0xA1, 0x5C]) == 0x71
+    assert PN5180RFSession._is_valid_bcc(b"\x01\x02\x03\x04\x04")
+    assert not PN5180RFSession._is_valid_bcc(b"\x01\x02\x03\x04\x05")
+    assert not PN5180RFSession._is_valid_bcc(b"\x01\x02\x03\x04")